@@ -1,8 +1,11 @@
 from fastapi.security import OAuth2PasswordBearer
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from app.core.security import decode_token
 from jwt import DecodeError, ExpiredSignatureError, MissingRequiredClaimError
 from app.models.user_model import User
+from app.schemas.user_schema import IUserPrincipal, IUserRead
+from app.core.config import settings
+from app.utils.etag import make_etag, etag_matches
 from app import crud
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -10,7 +13,7 @@ reusable_oauth2 = OAuth2PasswordBearer(
 )
 
 
-async def get_current_user(token: str = Depends(reusable_oauth2)) -> User:
+async def get_current_user(token: str = Depends(reusable_oauth2)) -> IUserRead | IUserPrincipal:
     try:
         payload = decode_token(token)
     except ExpiredSignatureError:
@@ -30,8 +33,25 @@ async def get_current_user(token: str = Depends(reusable_oauth2)) -> User:
         )
     user_id = int(payload.get("sub"))
 
-    user: User = await crud.user.get_by_id(id=user_id)
+    if settings.AUTH_CLAIMS_ONLY:
+        return IUserPrincipal(id=user_id)
+
+    user = await crud.user.get_cached_by_id(id=user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     return user
+
+
+async def get_tasks_cache_headers(request: Request, user: User = Depends(get_current_user)) -> dict[str, str]:
+    """
+    ETag of a task list response, derived from the user's task version and the request URL. When the
+    client already holds it, answers 304 before the route runs any query. The version is read before
+    the rows, so a write racing the read can only cost one extra full response, never a stale 304.
+    """
+    version = await crud.task.get_tasks_version(user.id)
+    etag = make_etag(user.id, version, request.url.path, sorted(request.query_params.multi_items()))
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return headers
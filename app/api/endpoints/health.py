@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+
+from app.core.hashing import hashing_executor
+from app.core.security import token_cache
+from app.crud.task_crud import task_page_cache
+from app.db.session import get_pool_stats
+from app.schemas.common_schema import IPoolStats, IHashingStats, ICacheStats, IPageCacheStats
+
+router = APIRouter()
+
+
+@router.get('/pool')
+async def pool_stats() -> IPoolStats:
+    return IPoolStats(**get_pool_stats())
+
+
+@router.get('/hashing')
+async def hashing_stats() -> IHashingStats:
+    return IHashingStats(**hashing_executor.stats())
+
+
+@router.get('/task-cache')
+async def task_cache_stats() -> IPageCacheStats:
+    return IPageCacheStats(**task_page_cache.stats())
+
+
+@router.get('/token-cache')
+async def token_cache_stats() -> ICacheStats:
+    return ICacheStats(**token_cache.stats())
@@ -1,55 +1,223 @@
-from datetime import date
-from fastapi import APIRouter, Depends, Query, Request, Response, status
+from datetime import date, datetime, timedelta, timezone
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from fastapi_pagination import Params, Page
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_tasks_cache_headers
 from app.models.user_model import User
-from app.schemas.task_schema import ITaskCreate, ITaskUpdate
+from app.schemas.task_schema import ITaskCreate, ITaskUpdate, ITaskBulkUpdate, ITaskBulkResult, ITaskExportFormatEnum
+from app.schemas.task_schema import ITaskImportFormatEnum, ITaskImportResult, ITaskStats, ITaskStatsBucketEnum
 from app.models.task_model import Task
-from app.schemas.common_schema import IOrderEnum
+from app.schemas.common_schema import IOrderEnum, ICursorParams, ICursorPage
 from app.schemas.task_schema import IOrderByTaskEnum
 from app.core.limiter import limiter
+from app.core.config import settings
+from app.utils.export import export_tasks, EXPORT_MEDIA_TYPES
+from app.utils.serialization import ResponseSerializer
+from app.utils.task_import import TaskImportParser
 from app import crud
 
 router = APIRouter()
 
+task_page_serializer = ResponseSerializer(Page[Task])
+task_cursor_page_serializer = ResponseSerializer(ICursorPage[Task])
+task_stats_serializer = ResponseSerializer(ITaskStats)
 
-@router.get("")
-async def get_task(params: Params = Depends(), user: User = Depends(get_current_user)) -> Page[Task]:
-    tasks = await crud.task.get_multy_tasks_paginated(params=params, current_user=user)
-    return tasks
 
+def cursor_params_key(cursor_params: ICursorParams) -> str:
+    return f"{cursor_params.size}:{cursor_params.include_total}:{cursor_params.cursor}"
 
-@router.get('/sorted')
+
+def json_response(content: bytes, headers: dict[str, str] | None = None) -> Response:
+    return Response(content=content, headers=headers, media_type="application/json")
+
+
+@router.get("", response_model=Page[Task])
+async def get_task(
+        params: Params = Depends(),
+        user: User = Depends(get_current_user),
+        cache_headers: dict[str, str] = Depends(get_tasks_cache_headers)
+) -> Response:
+    content = await crud.task.get_cached_page(
+        current_user=user,
+        key=f"page:{params.page}:{params.size}",
+        load=lambda: crud.task.get_multy_tasks_paginated(params=params, current_user=user),
+        serializer=task_page_serializer,
+    )
+    return json_response(content, headers=cache_headers)
+
+
+@router.get('/sorted', response_model=Page[Task])
 async def get_sorted_task(
         params: Params = Depends(),
         order_by: IOrderByTaskEnum = Query(default=IOrderByTaskEnum.id, description="It's optional. Default is id"),
         order: IOrderEnum = Query(default=IOrderEnum.ascendant, description="It's optional. Default is ascendant"),
-        user: User = Depends(get_current_user)
-) -> Page[Task]:
-    tasks = await crud.task.get_multy_tasks_sorted(
-        params=params,
-        order_by=order_by,
-        order=order,
-        current_user=user
+        user: User = Depends(get_current_user),
+        cache_headers: dict[str, str] = Depends(get_tasks_cache_headers)
+) -> Response:
+    content = await crud.task.get_cached_page(
+        current_user=user,
+        key=f"sorted:{order_by.value}:{order.value}:{params.page}:{params.size}",
+        load=lambda: crud.task.get_multy_tasks_sorted(
+            params=params,
+            order_by=order_by,
+            order=order,
+            current_user=user
+        ),
+        serializer=task_page_serializer,
     )
-    return tasks
+    return json_response(content, headers=cache_headers)
 
 
-@router.get('/filtered')
+@router.get('/filtered', response_model=Page[Task])
 async def get_filtered_by_date_tasks(
         params: Params = Depends(),
         from_date: date = Query(default=date.today(), description="It's optional. Default is now"),
         to_date: date = Query(default=date.today(), description="It's optional. Default is now"),
         user: User = Depends(get_current_user)
-) -> Page[Task]:
-    tasks = await crud.task.get_multy_tasks_filtered_by_date(
-        params=params,
-        from_date=from_date,
-        to_date=to_date,
-        current_user=user
+) -> Response:
+    content = await crud.task.get_cached_page(
+        current_user=user,
+        key=f"filtered:{from_date}:{to_date}:{params.page}:{params.size}",
+        load=lambda: crud.task.get_multy_tasks_filtered_by_date(
+            params=params,
+            from_date=from_date,
+            to_date=to_date,
+            current_user=user
+        ),
+        serializer=task_page_serializer,
+    )
+    return json_response(content)
+
+
+@router.get('/search', response_model=Page[Task])
+async def search_tasks(
+        q: str = Query(min_length=1, max_length=200, description="Words to find, \"quoted phrases\", or, -excluded"),
+        params: Params = Depends(),
+        user: User = Depends(get_current_user)
+) -> Response:
+    content = await crud.task.get_cached_page(
+        current_user=user,
+        key=f"search:{q}:{params.page}:{params.size}",
+        load=lambda: crud.task.search_tasks(q=q, params=params, current_user=user),
+        serializer=task_page_serializer,
+    )
+    return json_response(content)
+
+
+@router.get("/cursor", response_model=ICursorPage[Task])
+async def get_task_by_cursor(
+        cursor_params: ICursorParams = Depends(),
+        user: User = Depends(get_current_user),
+        cache_headers: dict[str, str] = Depends(get_tasks_cache_headers)
+) -> Response:
+    content = await crud.task.get_cached_page(
+        current_user=user,
+        key=f"cursor:{cursor_params_key(cursor_params)}",
+        load=lambda: crud.task.get_multy_tasks_paginated(cursor_params=cursor_params, current_user=user),
+        serializer=task_cursor_page_serializer,
+    )
+    return json_response(content, headers=cache_headers)
+
+
+@router.get('/sorted/cursor', response_model=ICursorPage[Task])
+async def get_sorted_task_by_cursor(
+        cursor_params: ICursorParams = Depends(),
+        order_by: IOrderByTaskEnum = Query(default=IOrderByTaskEnum.id, description="It's optional. Default is id"),
+        order: IOrderEnum = Query(default=IOrderEnum.ascendant, description="It's optional. Default is ascendant"),
+        user: User = Depends(get_current_user),
+        cache_headers: dict[str, str] = Depends(get_tasks_cache_headers)
+) -> Response:
+    content = await crud.task.get_cached_page(
+        current_user=user,
+        key=f"sorted-cursor:{order_by.value}:{order.value}:{cursor_params_key(cursor_params)}",
+        load=lambda: crud.task.get_multy_tasks_sorted(
+            cursor_params=cursor_params,
+            order_by=order_by,
+            order=order,
+            current_user=user
+        ),
+        serializer=task_cursor_page_serializer,
+    )
+    return json_response(content, headers=cache_headers)
+
+
+@router.get('/filtered/cursor', response_model=ICursorPage[Task])
+async def get_filtered_by_date_tasks_by_cursor(
+        cursor_params: ICursorParams = Depends(),
+        from_date: date = Query(default=date.today(), description="It's optional. Default is now"),
+        to_date: date = Query(default=date.today(), description="It's optional. Default is now"),
+        user: User = Depends(get_current_user)
+) -> Response:
+    content = await crud.task.get_cached_page(
+        current_user=user,
+        key=f"filtered-cursor:{from_date}:{to_date}:{cursor_params_key(cursor_params)}",
+        load=lambda: crud.task.get_multy_tasks_filtered_by_date(
+            cursor_params=cursor_params,
+            from_date=from_date,
+            to_date=to_date,
+            current_user=user
+        ),
+        serializer=task_cursor_page_serializer,
     )
-    return tasks
+    return json_response(content)
+
+
+@router.get('/stats', response_model=ITaskStats)
+async def get_task_stats(
+        bucket: ITaskStatsBucketEnum = Query(default=ITaskStatsBucketEnum.day, description="Default is day"),
+        from_date: date | None = Query(default=None, alias="from", description="Default is a year before `to`"),
+        to_date: date | None = Query(default=None, alias="to", description="Default is today (UTC)"),
+        user: User = Depends(get_current_user)
+) -> Response:
+    """Number of tasks created per bucket between `from` and `to` (inclusive), empty buckets left out."""
+    to_date = to_date or datetime.now(timezone.utc).date()
+    from_date = from_date or to_date - min(timedelta(days=365), to_date - date.min)
+    if from_date > to_date:
+        raise HTTPException(status_code=400, detail="`from` must not be after `to`")
+    content = await crud.task.get_cached_page(
+        current_user=user,
+        key=f"stats:{bucket.value}:{from_date}:{to_date}",
+        load=lambda: crud.task.get_task_stats(
+            current_user=user,
+            bucket=bucket,
+            from_date=from_date,
+            to_date=to_date
+        ),
+        serializer=task_stats_serializer,
+    )
+    return json_response(content)
+
+
+@router.get('/export')
+async def export_all_tasks(
+        export_format: ITaskExportFormatEnum = Query(default=ITaskExportFormatEnum.ndjson, alias="format"),
+        user: User = Depends(get_current_user)
+) -> StreamingResponse:
+    return StreamingResponse(
+        export_tasks(user.id, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{export_format.value}"'},
+    )
+
+
+@router.post('/import', status_code=201)
+@limiter.limit("10/minute", error_message="Too many requests")
+async def import_all_tasks(
+        request: Request,
+        import_format: ITaskImportFormatEnum = Query(default=ITaskImportFormatEnum.ndjson, alias="format"),
+        current_user: User = Depends(get_current_user)
+) -> ITaskImportResult:
+    """Streams an NDJSON or CSV upload (title, description and optional create_at) into the user's tasks."""
+    parser = TaskImportParser(
+        import_format,
+        max_errors=settings.TASK_IMPORT_MAX_ERRORS,
+        max_line_length=settings.TASK_IMPORT_MAX_LINE_LENGTH,
+    )
+    imported = await crud.task.import_tasks(
+        parser.parse(request.stream()), current_user, chunk_size=settings.TASK_IMPORT_CHUNK_SIZE
+    )
+    return ITaskImportResult(imported=imported, failed=parser.failed, errors=parser.errors)
 
 
 @router.post("", status_code=201)
@@ -74,3 +242,31 @@ async def update_task(
 async def remove_task(id: int, current_user: User = Depends(get_current_user)):
     await crud.task.remove_task(id, current_user=current_user)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/bulk")
+@limiter.limit("100/minute", error_message="Too many requests")
+async def create_tasks_bulk(
+        request: Request,
+        new_tasks: list[ITaskCreate] = Body(..., max_length=settings.TASK_BULK_MAX_ITEMS),
+        current_user: User = Depends(get_current_user)) -> list[ITaskBulkResult]:
+    results = await crud.task.create_tasks_bulk(new_tasks, current_user)
+    return results
+
+
+@router.put("/bulk")
+@limiter.limit("100/minute", error_message="Too many requests")
+async def update_tasks_bulk(
+        request: Request,
+        new_data: list[ITaskBulkUpdate] = Body(..., max_length=settings.TASK_BULK_MAX_ITEMS),
+        current_user: User = Depends(get_current_user)) -> list[ITaskBulkResult]:
+    results = await crud.task.update_tasks_bulk(new_data, current_user=current_user)
+    return results
+
+
+@router.delete("/bulk")
+async def remove_tasks_bulk(
+        ids: list[int] = Body(..., max_length=settings.TASK_BULK_MAX_ITEMS),
+        current_user: User = Depends(get_current_user)) -> list[ITaskBulkResult]:
+    results = await crud.task.remove_tasks_bulk(ids, current_user=current_user)
+    return results
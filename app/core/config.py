@@ -3,7 +3,9 @@ from pydantic_core.core_schema import FieldValidationInfo
 from pydantic import PostgresDsn, field_validator, AnyHttpUrl
 from typing import Any
 from enum import Enum
+import os
 import secrets
+import tempfile
 
 
 class ModeEnum(str, Enum):
@@ -12,6 +14,11 @@ class ModeEnum(str, Enum):
     testing = "testing"
 
 
+class HashExecutorEnum(str, Enum):
+    thread = "thread"
+    process = "process"
+
+
 class Settings(BaseSettings):
     MODE: ModeEnum = ModeEnum.development
     # Database
@@ -24,7 +31,42 @@ class Settings(BaseSettings):
     # Token settings
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 1  # 1 hour
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 100  # 100 days
+    # Authenticated user cache, 0 disables it
+    USER_CACHE_SIZE: int = 1024
+    USER_CACHE_TTL: int = 60  # seconds
+    # Build the current user from the token claims only, without a database lookup
+    AUTH_CLAIMS_ONLY: bool = False
+    # Verified token claims, kept until the token expires, 0 disables the cache
+    TOKEN_CACHE_SIZE: int = 4096
+    TOKEN_CACHE_TTL: int = 60 * 5  # seconds, upper bound on top of the token's own expiry
+    # Password hashing runs outside the event loop
+    PASSWORD_HASH_EXECUTOR: HashExecutorEnum = HashExecutorEnum.thread
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 16  # jobs handed to the executor at once, the rest wait
     ASYNC_DATABASE_URI: PostgresDsn | str = ""
+    # Read replicas (JSON list of postgresql+asyncpg URIs) serving plain SELECTs, they may lag behind the primary
+    DATABASE_REPLICA_URIS: list[PostgresDsn | str] = []
+    DB_REPLICA_RETRY_AFTER: float = 30  # seconds an unreachable replica is left out
+    # Tasks
+    TASK_BULK_MAX_ITEMS: int = 500  # items accepted by one /task/bulk request
+    TASK_EXPORT_BATCH_SIZE: int = 1000  # rows fetched per server-side cursor round trip
+    TASK_IMPORT_CHUNK_SIZE: int = 5000  # rows sent per COPY by /task/import
+    TASK_IMPORT_MAX_ERRORS: int = 100  # failed lines listed in the import result, the rest are only counted
+    TASK_IMPORT_MAX_LINE_LENGTH: int = 64 * 1024  # characters
+    # Serialized task pages, memory:// per process or sqlite:///path shared by the workers of a host
+    TASK_CACHE_URI: str = "memory://"
+    TASK_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 0 disables the cache
+    # Connection pool settings
+    DB_POOL_SIZE: int = 83  # total connection budget shared by all workers, overflow included
+    WEB_CONCURRENCY: int = 0  # number of worker processes sharing the budget, 0 picks one per CPU
+    DB_MIN_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_WARMUP: int = 5  # connections each worker opens and prepares at startup, capped at its pool size
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 60 * 30  # seconds
+    DB_POOL_TIMEOUT: float = 30  # seconds to wait for a free connection
+    # Statements kept prepared per connection by the asyncpg driver, 0 turns it off (e.g. behind pgbouncer)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
 
     @field_validator("ASYNC_DATABASE_URI", mode="after")
     def assemble_db_connection(cls, v: str | None, info: FieldValidationInfo) -> Any:
@@ -47,9 +89,34 @@ class Settings(BaseSettings):
                 )
         return v
 
+    @property
+    def WORKERS(self) -> int:
+        """Worker processes, one per usable CPU unless set, never more than the budget can hold."""
+        fits = max(self.DB_POOL_SIZE // (self.DB_MIN_POOL_SIZE + self.DB_MAX_OVERFLOW), 1)
+        if self.WEB_CONCURRENCY > 0:
+            return min(self.WEB_CONCURRENCY, fits)
+        cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+        return min(cpus, fits)
+
+    @property
+    def POOL_SIZE(self) -> int:
+        """Connections kept open by a single worker, its overflow on top still fits in its share of the budget."""
+        return max(self.DB_POOL_SIZE // self.WORKERS - self.DB_MAX_OVERFLOW, self.DB_MIN_POOL_SIZE)
+
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ENCRYPT_KEY: str = secrets.token_urlsafe(32)
     BACKEND_CORS_ORIGINS: list[str] | list[AnyHttpUrl] | None = None
+    # Rate limiting, the default sqlite file is shared by all workers on the host (memory:// or redis:// also work)
+    RATE_LIMIT_STORAGE_URI: str = f"sqlite:///{tempfile.gettempdir()}/todo-api-rate-limit.sqlite"
+    RATE_LIMIT_STRATEGY: str = "todo-api-sliding-window-counter"
+    # Seconds `python -m app.server` waits for in-flight requests on SIGTERM before closing them
+    GRACEFUL_SHUTDOWN_TIMEOUT: int = 30
+    # Expose Prometheus metrics on /metrics
+    METRICS_ENABLED: bool = False
+    # Expose pool, hashing and cache internals on /health/*, unauthenticated, so only on internal deployments
+    HEALTH_STATS_ENABLED: bool = False
+    # Same statement run this many times in one request is logged as a suspected N+1 (development/testing)
+    DB_N_PLUS_ONE_THRESHOLD: int = 3
 
     @field_validator("BACKEND_CORS_ORIGINS")
     def assemble_cors_origins(cls, v: str | list[str]) -> list[str] | str:
@@ -0,0 +1,73 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from app.core.config import HashExecutorEnum, settings
+
+
+class HashingExecutor:
+    """
+    Runs CPU-heavy password hashing in a thread or process pool so it does not block the event loop.
+    At most `max_concurrency` jobs are submitted at once, callers above that wait in line.
+    """
+
+    def __init__(self, kind: HashExecutorEnum, max_workers: int, max_concurrency: int):
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == HashExecutorEnum.process:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hashing")
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        self.waiting += 1
+        try:
+            await self._get_semaphore().acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            return await loop.run_in_executor(self._get_executor(), partial(func, *args))
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, int | str]:
+        return {
+            "executor": self.kind.value,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+        }
+
+
+hashing_executor = HashingExecutor(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+)
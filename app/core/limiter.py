@@ -1,4 +1,10 @@
 from slowapi import Limiter
-from slowapi.util import get_remote_address
 
-limiter = Limiter(key_func=get_remote_address)
+from app.core.config import settings
+from app.core.rate_limit import get_user_or_remote_address
+
+limiter = Limiter(
+    key_func=get_user_or_remote_address,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+)
@@ -0,0 +1,137 @@
+import os
+import time
+import weakref
+
+from fastapi import Request
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram
+from prometheus_client import generate_latest, multiprocess
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# With several workers set PROMETHEUS_MULTIPROC_DIR, every worker then writes its samples to that directory
+# and /metrics merges them.
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ["method", "route"]
+)
+REQUEST_COUNT = Counter(
+    "http_requests_total", "HTTP responses by route and status", ["method", "route", "status"]
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Database statement duration", ["operation"],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections", "Connections checked out of the pools of every engine",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_capacity_connections", "Pool size plus max overflow, summed over the same engines",
+    multiprocess_mode="livesum",
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total", "Requests rejected by the rate limiter", ["route"]
+)
+
+DB_OPERATIONS = {"select", "insert", "update", "delete"}
+
+_instrumented_engines: weakref.WeakSet = weakref.WeakSet()
+
+
+def _route_path(scope: Scope) -> str:
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency and status of every HTTP request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # labelled children are looked up once per label set and reused
+        self._latency = {}
+        self._count = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            key = (scope["method"], _route_path(scope))
+            latency = self._latency.get(key)
+            if latency is None:
+                latency = self._latency[key] = REQUEST_LATENCY.labels(*key)
+            latency.observe(time.perf_counter() - start)
+            count_key = (*key, status_code)
+            count = self._count.get(count_key)
+            if count is None:
+                count = self._count[count_key] = REQUEST_COUNT.labels(*count_key)
+            count.inc()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Records statement durations and pool checkouts through SQLAlchemy engine and pool events."""
+    sync_engine = engine.sync_engine
+    if sync_engine in _instrumented_engines:
+        return
+    _instrumented_engines.add(sync_engine)
+    durations = {operation: DB_QUERY_DURATION.labels(operation) for operation in DB_OPERATIONS | {"other"}}
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        operation = statement.lstrip()[:6].lower()
+        durations[operation if operation in DB_OPERATIONS else "other"].observe(
+            time.perf_counter() - context._metrics_start
+        )
+
+    @event.listens_for(sync_engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+
+    pool = sync_engine.pool
+    if isinstance(pool, QueuePool):
+        # Summed like the checkouts, so the saturation ratio holds with replicas
+        DB_POOL_CAPACITY.inc(pool.size() + settings.DB_MAX_OVERFLOW)
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    RATE_LIMIT_REJECTIONS.labels(_route_path(request.scope)).inc()
+    return _rate_limit_exceeded_handler(request, exc)
+
+
+def render_metrics() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
+
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
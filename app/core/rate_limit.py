@@ -0,0 +1,157 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+
+import jwt
+from fastapi import Request
+from limits import RateLimitItem
+from limits.storage import Storage
+from limits.strategies import STRATEGIES, RateLimiter
+from limits.util import WindowStats
+from slowapi.util import get_remote_address
+
+from app.core.security import decode_token
+
+# Project-specific name, so it never shadows or is shadowed by a strategy that ships with limits
+SLIDING_WINDOW_COUNTER = "todo-api-sliding-window-counter"
+
+
+class SQLiteStorage(Storage):
+    """
+    Rate limit counters kept in a local SQLite file, so every worker process on the host shares them.
+    Registered for `sqlite:///relative/path` and `sqlite:////absolute/path` storage URIs.
+    Each counter update is a single indexed UPSERT, expired rows are swept now and then. Calls run on the
+    event loop, so a write lock held by another worker is waited for at most `busy_timeout` seconds before
+    sqlite3.OperationalError is raised, instead of stalling every request of this worker.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+    SWEEP_EVERY = 1000
+    BUSY_TIMEOUT = 0.1
+
+    def __init__(self, uri: str | None = None, wrap_exceptions: bool = False, busy_timeout: float | None = None,
+                 **options):
+        self.path = uri[len("sqlite:///"):] if uri else ":memory:"
+        self.busy_timeout = self.BUSY_TIMEOUT if busy_timeout is None else busy_timeout
+        self._local = threading.local()
+        self._writes = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit "
+            "(key TEXT PRIMARY KEY, value INTEGER NOT NULL, expiry REAL NOT NULL) WITHOUT ROWID"
+        )
+
+    @property
+    def base_exceptions(self) -> type[Exception]:
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None or getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def incr(self, key: str, expiry: int, elastic_expiry: bool = False, amount: int = 1) -> int:
+        now = time.time()
+        connection = self._connection()
+        value = connection.execute(
+            "INSERT INTO rate_limit (key, value, expiry) VALUES (:key, :amount, :expiry) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "value = CASE WHEN expiry <= :now THEN :amount ELSE value + :amount END, "
+            "expiry = CASE WHEN expiry <= :now OR :elastic THEN :expiry ELSE expiry END "
+            "RETURNING value",
+            {"key": key, "amount": amount, "expiry": now + expiry, "now": now, "elastic": elastic_expiry},
+        ).fetchone()[0]
+        self._writes += 1
+        if self._writes % self.SWEEP_EVERY == 0:
+            connection.execute("DELETE FROM rate_limit WHERE expiry <= ?", (now,))
+        return value
+
+    def get(self, key: str) -> int:
+        row = self._connection().execute(
+            "SELECT value FROM rate_limit WHERE key = ? AND expiry > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> int:
+        row = self._connection().execute("SELECT expiry FROM rate_limit WHERE key = ?", (key,)).fetchone()
+        return int(row[0]) if row else int(time.time())
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute("SELECT 1")
+        except sqlite3.Error:
+            return False
+        return True
+
+    def reset(self) -> int | None:
+        return self._connection().execute("DELETE FROM rate_limit").rowcount
+
+    def clear(self, key: str) -> None:
+        self._connection().execute("DELETE FROM rate_limit WHERE key = ?", (key,))
+
+
+class SlidingWindowCounterRateLimiter(RateLimiter):
+    """
+    Sliding window approximated from the current and the previous fixed window: the previous count is
+    weighted by how much of it still overlaps the sliding window. Needs only `incr` and `get`, so it runs
+    on any storage (memory, sqlite, redis, ...) at a constant cost per check.
+    """
+
+    def _window(self, item: RateLimitItem, identifiers: tuple[str, ...]) -> tuple[str, str, float, float]:
+        window = item.get_expiry()
+        now = time.time()
+        index = int(now // window)
+        key = item.key_for(*identifiers)
+        return f"{key}/{index}", f"{key}/{index - 1}", 1 - (now % window) / window, (index + 1) * window
+
+    def _previous_weight(self, previous_key: str, weight: float) -> float:
+        return self.storage.get(previous_key) * weight
+
+    def hit(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        current_key, previous_key, weight, _ = self._window(item, identifiers)
+        current = self.storage.incr(current_key, item.get_expiry() * 2, amount=cost)
+        if self._previous_weight(previous_key, weight) + current > item.amount:
+            self.storage.incr(current_key, item.get_expiry() * 2, amount=-cost)
+            return False
+        return True
+
+    def test(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        current_key, previous_key, weight, _ = self._window(item, identifiers)
+        return self._previous_weight(previous_key, weight) + self.storage.get(current_key) + cost <= item.amount
+
+    def get_window_stats(self, item: RateLimitItem, *identifiers: str) -> WindowStats:
+        current_key, previous_key, weight, window_end = self._window(item, identifiers)
+        used = self._previous_weight(previous_key, weight) + self.storage.get(current_key)
+        return WindowStats(int(window_end), max(0, item.amount - math.ceil(used)))
+
+
+def register_strategy(name: str, strategy: type[RateLimiter]) -> None:
+    """Makes `strategy` available to Limiter(strategy=name), refusing to replace another one."""
+    registered = STRATEGIES.get(name)
+    if registered is not None and registered is not strategy:
+        raise RuntimeError(f"Rate limit strategy {name!r} is already registered to {registered.__qualname__}")
+    STRATEGIES[name] = strategy
+
+
+register_strategy(SLIDING_WINDOW_COUNTER, SlidingWindowCounterRateLimiter)
+
+
+def get_user_or_remote_address(request: Request) -> str:
+    """Rate limit key: the user id from a valid bearer or cookie token, else the client address."""
+    authorization = request.headers.get("Authorization", "")
+    token = authorization[7:] if authorization[:7].lower() == "bearer " else request.cookies.get("access_token")
+    if token:
+        try:
+            return f"user:{decode_token(token)['sub']}"
+        except (jwt.PyJWTError, KeyError):
+            pass
+    return get_remote_address(request)
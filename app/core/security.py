@@ -1,16 +1,23 @@
+import functools
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Any
 
 import bcrypt
 import jwt
-from cryptography.fernet import Fernet
 
 from app.core.config import settings
-
-fernet = Fernet(str.encode(settings.ENCRYPT_KEY))
+from app.core.hashing import hashing_executor
+from app.utils.cache import TTLCache
 
 JWT_ALGORITHM = "HS256"
 
+# Claims of tokens whose signature was already verified, keyed by a digest of the token
+token_cache: TTLCache[bytes, dict[str, Any]] = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL
+)
+
 
 def create_access_token(subject: str | Any, expires_delta: timedelta = None) -> str:
     if expires_delta:
@@ -46,6 +53,20 @@ def create_refresh_token(subject: str | Any, expires_delta: timedelta = None) ->
 
 
 def decode_token(token: str) -> dict[str: Any]:
+    """Verified claims of the token. Repeated tokens are served from token_cache until they expire."""
+    if not token_cache.enabled:
+        return verify_token(token)
+    digest = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = token_cache.get(digest)
+    if payload is None:
+        payload = verify_token(token)
+        ttl = payload.get("exp", 0) - time.time()
+        if ttl > 0:
+            token_cache.set(digest, payload, ttl=ttl)
+    return dict(payload)
+
+
+def verify_token(token: str) -> dict[str: Any]:
     return jwt.decode(
         jwt=token,
         key=str.encode(settings.SECRET_KEY),
@@ -69,10 +90,26 @@ def get_password_hash(plain_password: str | bytes) -> str:
     return bcrypt.hashpw(plain_password, bcrypt.gensalt()).decode()
 
 
+async def verify_password_async(plain_password: str | bytes, hashed_password: str | bytes) -> bool:
+    return await hashing_executor.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(plain_password: str | bytes) -> str:
+    return await hashing_executor.run(get_password_hash, plain_password)
+
+
+@functools.cache
+def get_fernet():
+    """Built on first use, cryptography is only imported by the callers that encrypt."""
+    from cryptography.fernet import Fernet
+
+    return Fernet(str.encode(settings.ENCRYPT_KEY))
+
+
 def get_data_encrypt(data) -> str:
-    data = fernet.encrypt(data)
+    data = get_fernet().encrypt(data)
     return data.decode()
 
 
 def get_content(variable: str) -> str:
-    return fernet.decrypt(variable.encode()).decode()
+    return get_fernet().decrypt(variable.encode()).decode()
@@ -0,0 +1,56 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import ModeEnum, Settings
+
+DEVELOPMENT_CSP = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+    "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+    "img-src 'self' https://fastapi.tiangolo.com data:; "
+    "font-src 'self' https://cdn.jsdelivr.net; "
+    "connect-src 'self'; "
+    "frame-src 'self'; "
+    "object-src 'none'; "
+    "base-uri 'self'; "
+    "form-action 'self'; "
+    "frame-ancestors 'none'; "
+    "worker-src 'self' blob:; "
+)
+# In production, you might want to use a more restrictive policy
+PRODUCTION_CSP = "default-src 'self'"
+
+
+def build_security_headers(settings: Settings) -> list[tuple[bytes, bytes]]:
+    """Raw security headers for the configured mode. CORS headers are left to CORSMiddleware."""
+    if settings.MODE in [ModeEnum.development, ModeEnum.testing]:
+        csp = DEVELOPMENT_CSP
+    else:
+        csp = PRODUCTION_CSP
+    return [
+        (b"x-xss-protection", b"1; mode=block"),
+        (b"x-frame-options", b"DENY"),
+        (b"content-security-policy", csp.encode("latin-1")),
+    ]
+
+
+class SecurityHeadersMiddleware:
+    """
+    Pure ASGI middleware appending a header block built once at startup to every HTTP response,
+    without wrapping the response body, so streaming responses pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, headers: list[tuple[bytes, bytes]]):
+        self.app = app
+        self.headers = headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *self.headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,114 @@
+import logging
+import time
+import weakref
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+_tracked_engines: weakref.WeakSet = weakref.WeakSet()
+
+
+class QueryStats:
+    """Statements issued while a tracking context is active."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def merge(self, other: "QueryStats") -> None:
+        self.count += other.count
+        self.duration += other.duration
+        self.statements.update(other.statements)
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Statements run at least `threshold` times, the usual sign of an N+1 pattern."""
+        return {statement: count for statement, count in self.statements.items() if count >= threshold}
+
+    def report(self) -> str:
+        lines = [f"{self.count} queries in {self.duration * 1000:.2f}ms"]
+        lines += [f"  {count}x {statement}" for statement, count in self.statements.most_common()]
+        return "\n".join(lines)
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collects the statements run inside the block, nested blocks also report to the outer ones."""
+    parent = _current_stats.get()
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+        if parent is not None:
+            parent.merge(stats)
+
+
+def install_query_tracking(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    # create_app may run more than once per process, the listeners must not stack up
+    if sync_engine in _tracked_engines:
+        return
+    _tracked_engines.add(sync_engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._tracking_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, time.perf_counter() - context._tracking_start)
+
+
+class QueryAccountingMiddleware:
+    """
+    Pure ASGI middleware adding X-DB-Queries and X-DB-Time (milliseconds) headers to every response and
+    logging statements repeated `n_plus_one_threshold` times or more within one request.
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 3):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_headers(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-db-queries", str(stats.count).encode()),
+                        (b"x-db-time", f"{stats.duration * 1000:.3f}".encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
+
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        if repeated:
+            logger.warning(
+                "Suspected N+1 queries in %s %s:\n%s",
+                scope["method"], scope["path"],
+                "\n".join(f"  {count}x {statement}" for statement, count in repeated.items()),
+            )
@@ -4,7 +4,7 @@ from fastapi import HTTPException
 from sqlmodel import SQLModel
 from fastapi_async_sqlalchemy import db
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, insert
 from pydantic import BaseModel
 
 ModelType = TypeVar("ModelType", bound=SQLModel)
@@ -18,14 +18,15 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType, SchemaType
     def __init__(self, model: type[ModelType]):
         self.model = model
         self.db = db
+        # Built once, see the hot statements in task_crud
+        self._by_id = select(model).where(model.id == bindparam("id"))
 
     def get_db(self) -> type(db):
         return self.db
 
     async def get_by_id(self, id: int, db_session: AsyncSession | None = None) -> ModelType | None:
         db_session = db_session or self.db.session
-        query = select(self.model).where(self.model.id == id)
-        response = await db_session.execute(query)
+        response = await db_session.execute(self._by_id, {"id": id})
         return response.scalar_one_or_none()
 
     async def create(
@@ -36,14 +37,15 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType, SchemaType
             -> ModelType:
         db_session = db_session or self.db.session
         db_obj = self.model.validate(obj_in)
+        values = db_obj.model_dump(exclude={"id"} if db_obj.id is None else None)
         try:
-            db_session.add(db_obj)
+            result = await db_session.execute(insert(self.model).values(values).returning(self.model))
+            db_obj = result.scalar_one()
             await db_session.commit()
         except exc.IntegrityError:
-            db_session.rollback()
+            await db_session.rollback()
             raise HTTPException(
                 status_code=409,
                 detail="Resource already exists",
             )
-        await db_session.refresh(db_obj)
         return db_obj
@@ -1,16 +1,73 @@
-from typing import Sequence
+from typing import AsyncIterator, Awaitable, Callable, Sequence, TypeVar
 from fastapi import HTTPException
 from .base_crud import CRUDBase
 from fastapi_pagination import Page, Params
+from fastapi_pagination.api import create_page
 from fastapi_pagination.ext.sqlmodel import paginate
 from app.models.user_model import User
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.schemas.common_schema import IOrderEnum
+from app.schemas.common_schema import IOrderEnum, ICursorParams, ICursorPage
+from app.utils.cursor import Cursor, encode_cursor, decode_cursor
 from sqlmodel import select
-from sqlalchemy import exc
-from app.schemas.task_schema import ITaskCreate, ITaskUpdate, ITaskRead, IOrderByTaskEnum
-from datetime import date
-from ..models import Task
+from sqlalchemy import exc, func, tuple_, and_, any_, bindparam, cast, column, delete, insert, literal_column, text
+from sqlalchemy import update, values
+from sqlalchemy import BigInteger, Date, DateTime, Integer, String, Text
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.sql import Select
+from app.schemas.task_schema import (
+    ITaskCreate, ITaskUpdate, ITaskRead, IOrderByTaskEnum, ITaskBulkUpdate, ITaskBulkResult, ITaskImport,
+    ITaskStats, ITaskStatsBucket, ITaskStatsBucketEnum
+)
+from app.core.config import settings
+from app.utils.page_cache import PageCache, get_page_cache_backend
+from app.utils.serialization import ResponseSerializer
+from datetime import date, datetime, timezone
+from ..models import Task, TaskStats, TaskVersion
+from ..models.task_model import TASK_SEARCH_CONFIG
+
+T = TypeVar("T")
+
+IMPORT_COLUMNS = ["user_id", "title", "description", "create_at"]
+
+# Hot statements, built once with bound parameters. SQLAlchemy memoizes the cache key of a statement object,
+# so running these skips building the construct and hashing it for the compiled cache on every call.
+TASK_BY_ID = select(Task).where(Task.id == bindparam("task_id"))
+TASK_COUNTERS = select(TaskVersion.version, TaskVersion.task_count).where(TaskVersion.user_id == bindparam("user_id"))
+USER_TASK_PAGE = (
+    select(Task)
+    .where(Task.user_id == bindparam("user_id"))
+    .limit(bindparam("limit", type_=Integer))
+    .offset(bindparam("offset", type_=Integer))
+)
+# By (order_by, ascending)
+SORTED_USER_TASK_PAGES = {
+    (order_by, ascending): USER_TASK_PAGE.order_by(
+        Task.__table__.columns[order_by].asc() if ascending else Task.__table__.columns[order_by].desc()
+    )
+    for order_by in IOrderByTaskEnum
+    for ascending in (True, False)
+}
+# By bucket. The rollup is per day, week and month buckets add its rows up. date_trunc gets a literal unit,
+# so the grouped expression is the same in SELECT and GROUP BY.
+TASK_STATS_HISTOGRAMS = {
+    bucket: select(start.label("start"), cast(func.sum(TaskStats.created), BigInteger).label("created"))
+    .where(TaskStats.user_id == bindparam("user_id"))
+    .where(TaskStats.day.between(bindparam("from_date", type_=Date), bindparam("to_date", type_=Date)))
+    .group_by(start)
+    .having(func.sum(TaskStats.created) > 0)
+    .order_by(start)
+    for bucket in ITaskStatsBucketEnum
+    for start in [cast(func.date_trunc(literal_column(f"'{bucket.value}'"), cast(TaskStats.day, DateTime)), Date)]
+}
+# The day a task counts for in task_stats, as the triggers compute it
+TASK_STATS_DAY = cast(func.timezone("UTC", Task.create_at), Date)
+
+# Serialized task pages. Keys carry the user's task version, so pages cached before a write made by another
+# worker are never served; writes made here also drop the user's pages right away.
+task_page_cache = PageCache(
+    get_page_cache_backend(settings.TASK_CACHE_URI, settings.TASK_CACHE_MAX_BYTES),
+    max_bytes=settings.TASK_CACHE_MAX_BYTES,
+)
 
 
 class CRUDTasks(CRUDBase[Task, ITaskCreate, ITaskUpdate, ITaskRead]):
@@ -19,25 +76,32 @@ class CRUDTasks(CRUDBase[Task, ITaskCreate, ITaskUpdate, ITaskRead]):
             self,
             *,
             params: Params | None = Params(),
+            cursor_params: ICursorParams | None = None,
             current_user: User,
             db_session: AsyncSession | None = None
-    ) -> Page[Task]:
+    ) -> Page[Task] | ICursorPage[Task]:
         db_session = db_session or self.db.session
-        query = select(Task).where(Task.user_id == current_user.id)
-        output = await paginate(db_session, query, params)
-        return output
+        if cursor_params:
+            query = select(Task).where(Task.user_id == current_user.id)
+            return await self._paginate_by_cursor(db_session, query, cursor_params, user_id=current_user.id)
+        return await self._paginate_user_tasks(db_session, USER_TASK_PAGE, current_user.id, params)
 
     async def get_multy_tasks_filtered_by_date(
             self,
             *,
             params: Params | None = Params(),
+            cursor_params: ICursorParams | None = None,
             current_user: User,
             from_date: date,
             to_date: date,
             db_session: AsyncSession | None = None
-    ) -> Page[Task]:
+    ) -> Page[Task] | ICursorPage[Task]:
         db_session = db_session or self.db.session
         query = select(Task).where(Task.user_id == current_user.id).where(Task.create_at.between(from_date, to_date))
+        if cursor_params:
+            return await self._paginate_by_cursor(
+                db_session, query, cursor_params, order_by=IOrderByTaskEnum.create_at
+            )
         output = await paginate(db_session, query, params)
         return output
 
@@ -47,20 +111,125 @@ class CRUDTasks(CRUDBase[Task, ITaskCreate, ITaskUpdate, ITaskRead]):
             params: Params | None = Params(),
             order_by: IOrderByTaskEnum | None = IOrderByTaskEnum.id,
             order: IOrderEnum | None = IOrderEnum.ascendant,
+            cursor_params: ICursorParams | None = None,
             current_user: User,
             db_session: AsyncSession | None = None
-    ) -> Page[Task]:
+    ) -> Page[Task] | ICursorPage[Task]:
         db_session = db_session or self.db.session
+        if cursor_params:
+            query = select(Task).where(Task.user_id == current_user.id)
+            return await self._paginate_by_cursor(
+                db_session, query, cursor_params, order_by=order_by, order=order, user_id=current_user.id
+            )
 
-        columns = Task.__table__.columns
+        statement = SORTED_USER_TASK_PAGES[order_by, order == IOrderEnum.ascendant]
+        return await self._paginate_user_tasks(db_session, statement, current_user.id, params)
 
-        if order == IOrderEnum.ascendant:
-            query = select(Task).where(Task.user_id == current_user.id).order_by(columns[order_by].asc())
-        else:
-            query = select(Task).where(Task.user_id == current_user.id).order_by(columns[order_by].desc())
+    async def _paginate_user_tasks(
+            self,
+            db_session: AsyncSession,
+            statement: Select,
+            user_id: int,
+            params: Params | None,
+    ) -> Page[Task]:
+        """
+        Same page as paginate() builds, from one of the precompiled statements taking user_id, limit and
+        offset. The total comes from the user's task counter instead of a COUNT over their tasks.
+        """
+        params = params or Params()
+        raw_params = params.to_raw_params().as_limit_offset()
+        total = await self.get_tasks_count(user_id, db_session)
+        bind = {"user_id": user_id, "limit": raw_params.limit, "offset": raw_params.offset}
+        items = (await db_session.scalars(statement, bind)).all()
+        return create_page(items, total=total, params=params)
+
+    async def search_tasks(
+            self,
+            *,
+            q: str,
+            params: Params | None = Params(),
+            current_user: User,
+            db_session: AsyncSession | None = None
+    ) -> Page[Task]:
+        """The user's tasks matching a web search style query, best matches first (title above description)."""
+        db_session = db_session or self.db.session
+        search_vector = Task.__table__.c.search_vector
+        ts_query = func.websearch_to_tsquery(TASK_SEARCH_CONFIG, q)
+        query = (
+            select(Task)
+            .where(Task.user_id == current_user.id, search_vector.bool_op("@@")(ts_query))
+            .order_by(func.ts_rank_cd(search_vector, ts_query).desc(), Task.id)
+        )
         output = await paginate(db_session, query, params)
         return output
 
+    async def _paginate_by_cursor(
+            self,
+            db_session: AsyncSession,
+            query: Select,
+            cursor_params: ICursorParams,
+            order_by: IOrderByTaskEnum = IOrderByTaskEnum.id,
+            order: IOrderEnum = IOrderEnum.ascendant,
+            user_id: int | None = None,
+    ) -> ICursorPage[Task]:
+        """
+        Keyset pagination over (order_by, id), so every page costs the same as the first one. Pass `user_id`
+        when the query selects all of that user's tasks, the total then comes from their task counter.
+        """
+        column = Task.__table__.columns[order_by]
+        cursor = decode_cursor(cursor_params.cursor, order_by, order) if cursor_params.cursor else None
+        backwards = cursor is not None and cursor.backwards
+        ascending = (order == IOrderEnum.ascendant) != backwards
+
+        total = None
+        if cursor_params.include_total and user_id is not None:
+            total = await self.get_tasks_count(user_id, db_session)
+        elif cursor_params.include_total:
+            total = await db_session.scalar(select(func.count()).select_from(query.subquery()))
+
+        if cursor:
+            if order_by == IOrderByTaskEnum.id:
+                key, bound = Task.id, cursor.id
+            else:
+                key, bound = tuple_(column, Task.id), tuple_(cursor.value, cursor.id)
+            query = query.where(key > bound if ascending else key < bound)
+
+        if order_by == IOrderByTaskEnum.id:
+            sort_keys = [Task.id]
+        else:
+            sort_keys = [column, Task.id]
+        query = query.order_by(*[key.asc() if ascending else key.desc() for key in sort_keys])
+
+        result = await db_session.execute(query.limit(cursor_params.size + 1))
+        items = list(result.scalars().all())
+        has_more = len(items) > cursor_params.size
+        items = items[:cursor_params.size]
+        if backwards:
+            items.reverse()
+
+        def make_cursor(task: Task, to_previous: bool) -> str:
+            return encode_cursor(Cursor(
+                order_by=order_by,
+                order=order,
+                value=getattr(task, order_by.value),
+                id=task.id,
+                backwards=to_previous,
+            ))
+
+        next_cursor = previous_cursor = None
+        if items:
+            if has_more or backwards:
+                next_cursor = make_cursor(items[-1], to_previous=False)
+            if cursor is not None and (has_more or not backwards):
+                previous_cursor = make_cursor(items[0], to_previous=True)
+        return ICursorPage[Task](
+            items=items,
+            size=cursor_params.size,
+            total=total,
+            next_cursor=next_cursor,
+            previous_cursor=previous_cursor,
+        )
+
     async def get_task_by_owner_id(
             self,
             id: int,
@@ -80,10 +249,187 @@ class CRUDTasks(CRUDBase[Task, ITaskCreate, ITaskUpdate, ITaskRead]):
         result = await db_session.execute(query)
         return result.scalars().all()
 
+    async def stream_users_tasks(
+            self,
+            user_id: int,
+            batch_size: int,
+            db_session: AsyncSession | None = None
+    ) -> AsyncIterator[Sequence[Task]]:
+        """Yields the user's tasks in batches read through a server-side cursor."""
+        db_session = db_session or self.db.session
+        query = select(Task).where(Task.user_id == user_id).order_by(Task.id)
+        result = await db_session.stream_scalars(query.execution_options(yield_per=batch_size))
+        async for batch in result.partitions():
+            yield batch
+
+    async def get_tasks_version(self, user_id: int, db_session: AsyncSession | None = None) -> int:
+        """Change counter of the user's tasks, maintained by triggers on the task table, 0 before any write."""
+        return (await self._get_task_counters(user_id, db_session or self.db.session))[0]
+
+    async def get_tasks_count(self, user_id: int, db_session: AsyncSession | None = None) -> int:
+        """Number of tasks of the user, maintained by the same triggers as the version."""
+        return (await self._get_task_counters(user_id, db_session or self.db.session))[1]
+
+    @staticmethod
+    async def _get_task_counters(user_id: int, db_session: AsyncSession) -> tuple[int, int]:
+        """Version and task count of the user, read once per session until the session writes tasks."""
+        counters = db_session.info.setdefault("task_versions", {})
+        if user_id not in counters:
+            row = (await db_session.execute(TASK_COUNTERS, {"user_id": user_id})).one_or_none()
+            counters[user_id] = (row.version, row.task_count) if row else (0, 0)
+        return counters[user_id]
+
+    async def reconcile_task_counts(self, batch_size: int = 1000, db_session: AsyncSession | None = None) -> int:
+        """
+        Recounts the tasks of every user and fixes the counters that drifted, bumping their version so
+        cached pages with a wrong total are dropped. Returns how many counters were fixed. Each batch of
+        counters is locked before counting, so concurrent writes wait and then apply on the fixed value.
+        """
+        db_session = db_session or self.db.session
+        await db_session.execute(
+            pg_insert(TaskVersion).from_select(["user_id"], select(Task.user_id).distinct())
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        await db_session.commit()
+        fixed = 0
+        last_user_id = 0
+        while True:
+            user_ids = (await db_session.scalars(
+                select(TaskVersion.user_id)
+                .where(TaskVersion.user_id > last_user_id)
+                .order_by(TaskVersion.user_id)
+                .limit(batch_size)
+                .with_for_update()
+            )).all()
+            if not user_ids:
+                return fixed
+            last_user_id = user_ids[-1]
+            actual = (
+                select(func.count()).select_from(Task).where(Task.user_id == TaskVersion.user_id)
+                .scalar_subquery()
+            )
+            result = await db_session.execute(
+                update(TaskVersion)
+                .where(TaskVersion.user_id == any_(self._ids_param(list(user_ids))))
+                .where(TaskVersion.task_count != actual)
+                .values(task_count=actual, version=TaskVersion.version + 1)
+                .returning(TaskVersion.user_id),
+                execution_options={"synchronize_session": False},
+            )
+            drifted = result.scalars().all()
+            await db_session.commit()
+            for user_id in drifted:
+                self._tasks_changed(user_id, db_session)
+            fixed += len(drifted)
+
+    async def get_task_stats(
+            self,
+            *,
+            current_user: User,
+            bucket: ITaskStatsBucketEnum,
+            from_date: date,
+            to_date: date,
+            db_session: AsyncSession | None = None
+    ) -> ITaskStats:
+        """Tasks created per day, week or month between two dates (inclusive, UTC), from the task_stats rollup."""
+        db_session = db_session or self.db.session
+        rows = (await db_session.execute(
+            TASK_STATS_HISTOGRAMS[bucket],
+            {"user_id": current_user.id, "from_date": from_date, "to_date": to_date},
+        )).all()
+        buckets = [ITaskStatsBucket(start=row.start, created=row.created) for row in rows]
+        return ITaskStats(
+            bucket=bucket,
+            from_date=from_date,
+            to_date=to_date,
+            total=sum(item.created for item in buckets),
+            buckets=buckets,
+        )
+
+    async def rebuild_task_stats(self, batch_size: int = 1000, db_session: AsyncSession | None = None) -> int:
+        """
+        Recomputes the task_stats rollup from the task table and rewrites the users whose rows drifted,
+        bumping their version so cached histograms are dropped. Returns how many users were rewritten. Task
+        writes wait while a batch of users is recounted, one short transaction per batch.
+        """
+        db_session = db_session or self.db.session
+        rebuilt = 0
+        last_user_id = 0
+        while True:
+            await db_session.execute(text("LOCK TABLE task IN SHARE MODE"))
+            user_ids = list((await db_session.scalars(
+                select(User.id).where(User.id > last_user_id).order_by(User.id).limit(batch_size)
+            )).all())
+            if not user_ids:
+                await db_session.commit()
+                return rebuilt
+            last_user_id = user_ids[-1]
+            fresh = (
+                select(Task.user_id, TASK_STATS_DAY.label("day"), func.count().label("created"))
+                .where(Task.user_id == any_(self._ids_param(user_ids)))
+                .group_by(Task.user_id, TASK_STATS_DAY)
+                .cte("fresh")
+            )
+            stored = (
+                select(TaskStats.user_id, TaskStats.day, TaskStats.created)
+                .where(TaskStats.user_id == any_(self._ids_param(user_ids)))
+                .where(TaskStats.created != 0)
+                .cte("stored")
+            )
+            drifted = list((await db_session.scalars(
+                select(func.coalesce(fresh.c.user_id, stored.c.user_id)).distinct()
+                .select_from(fresh.join(
+                    stored, and_(fresh.c.user_id == stored.c.user_id, fresh.c.day == stored.c.day), full=True
+                ))
+                .where(func.coalesce(fresh.c.created, 0) != func.coalesce(stored.c.created, 0))
+            )).all())
+            if drifted:
+                await db_session.execute(delete(TaskStats).where(TaskStats.user_id == any_(self._ids_param(drifted))))
+                await db_session.execute(insert(TaskStats).from_select(
+                    ["user_id", "day", "created"],
+                    select(fresh).where(fresh.c.user_id == any_(bindparam("drifted", drifted, type_=ARRAY(Integer)))),
+                ))
+                await db_session.execute(
+                    pg_insert(TaskVersion).values([{"user_id": user_id, "version": 1} for user_id in drifted])
+                    .on_conflict_do_update(index_elements=["user_id"], set_={"version": TaskVersion.version + 1})
+                )
+            await db_session.commit()
+            for user_id in drifted:
+                self._tasks_changed(user_id, db_session)
+            rebuilt += len(drifted)
+
+    async def get_cached_page(
+            self,
+            *,
+            current_user: User,
+            key: str,
+            load: Callable[[], Awaitable[T]],
+            serializer: ResponseSerializer[T],
+            db_session: AsyncSession | None = None
+    ) -> bytes:
+        """Serialized page from task_page_cache, loaded with `load` and stored on a miss."""
+        db_session = db_session or self.db.session
+        if current_user.id in db_session.info.get("tasks_changed", ()):
+            # Written in this session, possibly not committed yet
+            return serializer.dump(await load())
+        version = await self.get_tasks_version(current_user.id, db_session)
+        cache_key = f"{version}:{key}"
+        content = task_page_cache.get(current_user.id, cache_key)
+        if content is None:
+            content = serializer.dump(await load())
+            task_page_cache.set(current_user.id, cache_key, content)
+        return content
+
+    @staticmethod
+    def _tasks_changed(user_id: int, db_session: AsyncSession) -> None:
+        """Drops the user's cached pages and stops caching them for the rest of the session."""
+        db_session.info.get("task_versions", {}).pop(user_id, None)
+        db_session.info.setdefault("tasks_changed", set()).add(user_id)
+        task_page_cache.invalidate(user_id)
+
     async def get_task_by_id(self, task_id: int, db_session: AsyncSession | None = None) -> Task | None:
         db_session = db_session or self.db.session
-        query = select(Task).where(Task.id == task_id)
-        result = await db_session.execute(query)
+        result = await db_session.execute(TASK_BY_ID, {"task_id": task_id})
         return result.scalar_one_or_none()
 
     async def create_task(
@@ -96,45 +442,225 @@ class CRUDTasks(CRUDBase[Task, ITaskCreate, ITaskUpdate, ITaskRead]):
         task_data = new_task.dict()
         task_data['user_id'] = user.id
         task = Task(**task_data)
+        query = insert(Task).values(task.model_dump(exclude={"id"})).returning(Task)
         try:
-            db_session.add(task)
+            result = await db_session.execute(query)
+            task = result.scalar_one()
             await db_session.commit()
         except exc.IntegrityError:
-            db_session.rollback()
+            await db_session.rollback()
             raise HTTPException(
                 status_code=409,
                 detail="Resource already exists",
             )
-        await db_session.refresh(task)
+        self._tasks_changed(user.id, db_session)
         return task
 
     async def update_task(self, task_id: int, new_data: Task, current_user: User, db_session: AsyncSession | None = None
                           ) -> Task:
         db_session = db_session or self.db.session
-        task = await self.get_task_by_owner_id(id=task_id, current_user=current_user)
+        task_data = new_data.dict(exclude_unset=True)
+        if not task_data:
+            return await self.get_task_by_owner_id(id=task_id, current_user=current_user, db_session=db_session)
+        query = (
+            update(Task)
+            .where(Task.id == task_id, Task.user_id == current_user.id)
+            .values(**task_data)
+            .returning(Task)
+        )
+        # Default synchronization applies the new values to a task already loaded in the session, which RETURNING
+        # then hands back, instead of leaving it stale
+        result = await db_session.execute(query)
+        task = result.scalar_one_or_none()
         if not task:
-            raise HTTPException(
-                status_code=404,
-                detail="Task not found",
-            )
-        for key, value in new_data.dict(exclude_unset=True).items():
-            setattr(task, key, value)
-        db_session.add(task)
+            await self._raise_not_owned(task_id, db_session)
         await db_session.commit()
-        await db_session.refresh(task)
+        self._tasks_changed(current_user.id, db_session)
         return task
 
     async def remove_task(self, task_id: int, current_user: User, db_session: AsyncSession | None = None) -> Task:
         db_session = db_session or self.db.session
-        task = await self.get_task_by_owner_id(id=task_id, current_user=current_user)
-        if not task:
+        query = (
+            delete(Task)
+            .where(Task.id == task_id, Task.user_id == current_user.id)
+            .returning(Task.id, Task.user_id, Task.title, Task.description, Task.create_at)
+        )
+        # "fetch" drops a task loaded earlier in the session from the identity map, using the RETURNING ids
+        result = await db_session.execute(query, execution_options={"synchronize_session": "fetch"})
+        row = result.one_or_none()
+        if not row:
+            await self._raise_not_owned(task_id, db_session)
+        await db_session.commit()
+        self._tasks_changed(current_user.id, db_session)
+        return Task(**row._mapping)
+
+    async def _raise_not_owned(self, task_id: int, db_session: AsyncSession) -> None:
+        """Called when an ownership-checked write matched no row: 404 for a missing task, 403 for a foreign one."""
+        await db_session.rollback()
+        owner_id = await db_session.scalar(select(Task.user_id).where(Task.id == task_id))
+        if owner_id is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        raise HTTPException(status_code=403, detail="You are not authorized to access this task")
+
+    async def create_tasks_bulk(
+            self,
+            new_tasks: list[ITaskCreate],
+            user: User,
+            db_session: AsyncSession | None = None
+    ) -> list[ITaskBulkResult]:
+        """Creates all tasks with one multi-row INSERT ... RETURNING."""
+        db_session = db_session or self.db.session
+        if not new_tasks:
+            return []
+        create_at = datetime.now(timezone.utc)
+        rows = [{**new_task.dict(), "user_id": user.id, "create_at": create_at} for new_task in new_tasks]
+        try:
+            result = await db_session.execute(insert(Task).returning(Task, sort_by_parameter_order=True), rows)
+            tasks = result.scalars().all()
+            await db_session.commit()
+        except exc.IntegrityError:
+            await db_session.rollback()
             raise HTTPException(
-                status_code=404,
-                detail="Task not found",
+                status_code=409,
+                detail="Resource already exists",
             )
-        await db_session.delete(task)
-        await db_session.commit()
-        return task
+        self._tasks_changed(user.id, db_session)
+        return [
+            ITaskBulkResult(
+                index=index, id=task.id, status_code=201, task=ITaskRead.model_validate(task, from_attributes=True)
+            )
+            for index, task in enumerate(tasks)
+        ]
+
+    async def update_tasks_bulk(
+            self,
+            new_data: list[ITaskBulkUpdate],
+            current_user: User,
+            db_session: AsyncSession | None = None
+    ) -> list[ITaskBulkResult]:
+        """Updates the user's tasks with one UPDATE ... FROM (VALUES ...) RETURNING."""
+        db_session = db_session or self.db.session
+        results, indexes = self._dedupe_bulk_ids([item.id for item in new_data])
+        if indexes:
+            data = values(
+                column("id", Integer), column("title", String), column("description", Text), name="data"
+            ).data([(new_data[index].id, new_data[index].title, new_data[index].description)
+                    for index in indexes.values()])
+            query = (
+                update(Task)
+                .where(Task.id == data.c.id, Task.user_id == current_user.id)
+                .values(title=data.c.title, description=data.c.description)
+                .returning(Task.id, Task.user_id, Task.title, Task.description)
+            )
+            result = await db_session.execute(query, execution_options={"synchronize_session": False})
+            updated = {row.id: row for row in result}
+            await self._fill_bulk_results(results, indexes, updated, 200, db_session)
+            await db_session.commit()
+            self._tasks_changed(current_user.id, db_session)
+        return results
+
+    async def remove_tasks_bulk(
+            self,
+            ids: list[int],
+            current_user: User,
+            db_session: AsyncSession | None = None
+    ) -> list[ITaskBulkResult]:
+        """Deletes the user's tasks with one DELETE ... WHERE id = ANY(...) RETURNING."""
+        db_session = db_session or self.db.session
+        results, indexes = self._dedupe_bulk_ids(ids)
+        if indexes:
+            query = (
+                delete(Task)
+                .where(Task.id == any_(self._ids_param(list(indexes))), Task.user_id == current_user.id)
+                .returning(Task.id)
+            )
+            result = await db_session.execute(query, execution_options={"synchronize_session": False})
+            deleted = {row.id: None for row in result}
+            await self._fill_bulk_results(results, indexes, deleted, 204, db_session)
+            await db_session.commit()
+            self._tasks_changed(current_user.id, db_session)
+        return results
+
+    async def import_tasks(
+            self,
+            tasks: AsyncIterator[ITaskImport],
+            user: User,
+            chunk_size: int,
+            db_session: AsyncSession | None = None
+    ) -> int:
+        """
+        Loads the tasks with COPY through the session's asyncpg connection, `chunk_size` rows per COPY,
+        and commits once at the end, so a failed or aborted upload leaves nothing behind.
+        """
+        db_session = db_session or self.db.session
+        connection = await db_session.connection()
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        create_at = datetime.now(timezone.utc)
+        imported = 0
+        rows = []
+        try:
+            async for task in tasks:
+                task_create_at = task.create_at or create_at
+                if task_create_at.tzinfo is None:
+                    task_create_at = task_create_at.replace(tzinfo=timezone.utc)
+                rows.append((user.id, task.title, task.description, task_create_at))
+                if len(rows) >= chunk_size:
+                    await driver_connection.copy_records_to_table("task", records=rows, columns=IMPORT_COLUMNS)
+                    imported += len(rows)
+                    rows = []
+            if rows:
+                await driver_connection.copy_records_to_table("task", records=rows, columns=IMPORT_COLUMNS)
+                imported += len(rows)
+            await db_session.commit()
+        except Exception:
+            await db_session.rollback()
+            raise
+        self._tasks_changed(user.id, db_session)
+        return imported
+
+    @staticmethod
+    def _ids_param(ids: list[int]):
+        return bindparam("ids", ids, type_=ARRAY(Integer))
+
+    @staticmethod
+    def _dedupe_bulk_ids(ids: list[int]) -> tuple[list[ITaskBulkResult | None], dict[int, int]]:
+        """Maps each id to the index of its first occurrence, later repeats get a 409 result."""
+        results: list[ITaskBulkResult | None] = [None] * len(ids)
+        indexes: dict[int, int] = {}
+        for index, task_id in enumerate(ids):
+            if task_id in indexes:
+                results[index] = ITaskBulkResult(
+                    index=index, id=task_id, status_code=409, detail="Task appears more than once in the request"
+                )
+            else:
+                indexes[task_id] = index
+        return results, indexes
+
+    async def _fill_bulk_results(
+            self,
+            results: list[ITaskBulkResult | None],
+            indexes: dict[int, int],
+            done: dict,
+            status_code: int,
+            db_session: AsyncSession
+    ) -> None:
+        """Sets the result of every id, telling apart missing tasks (404) from other users' tasks (403)."""
+        missing = [task_id for task_id in indexes if task_id not in done]
+        foreign = set()
+        if missing:
+            result = await db_session.execute(select(Task.id).where(Task.id == any_(self._ids_param(missing))))
+            foreign = set(result.scalars().all())
+        for task_id, index in indexes.items():
+            if task_id in done:
+                row = done[task_id]
+                task = ITaskRead.model_validate(row, from_attributes=True) if row is not None else None
+                results[index] = ITaskBulkResult(index=index, id=task_id, status_code=status_code, task=task)
+            elif task_id in foreign:
+                results[index] = ITaskBulkResult(
+                    index=index, id=task_id, status_code=403, detail="You are not authorized to access this task"
+                )
+            else:
+                results[index] = ITaskBulkResult(index=index, id=task_id, status_code=404, detail="Task not found")
 
 
 task = CRUDTasks(Task)
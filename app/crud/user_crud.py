@@ -3,39 +3,93 @@ from app.models.user_model import User
 from app.schemas.user_schema import IUserCreate, IUserUpdate, IUserRead
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-from app.core.security import get_password_hash, verify_password
+from sqlalchemy import bindparam, event, insert
+from sqlalchemy.orm import ORMExecuteState, Session
+from app.core.config import settings
+from app.core.security import get_password_hash_async, verify_password_async
+from app.utils.cache import TTLCache
+
+# Per-process cache of authenticated users, without their password hash. Other workers only pick up changes
+# after the TTL.
+user_cache: TTLCache[int, IUserRead] = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+
+# Built once, see the hot statements in task_crud
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
 
 
 class CRUDUser(CRUDBase[User, IUserCreate, IUserUpdate, IUserRead]):
 
     async def get_by_email(self, *, email: str, db_session: AsyncSession | None = None) -> User | None:
         db_session = db_session or super().get_db().session
-        user = await db_session.execute(select(User).where(User.email == email))
+        user = await db_session.execute(USER_BY_EMAIL, {"email": email})
         return user.scalar_one_or_none()
 
+    async def get_cached_by_id(self, id: int, db_session: AsyncSession | None = None) -> IUserRead | None:
+        """The public fields of the user, served from user_cache while the entry is fresh."""
+        cached = user_cache.get(id)
+        if cached is not None:
+            return cached
+        user = await self.get_by_id(id, db_session=db_session)
+        if not user:
+            return None
+        cached = IUserRead(id=user.id, name=user.name, email=user.email)
+        user_cache.set(id, cached)
+        return cached
+
     async def authenticate(self, *, email: str, password: str, db_session: AsyncSession | None = None) -> User | None:
         db_session = db_session or super().get_db().session
         user = await self.get_by_email(email=email, db_session=db_session)
         if not user:
             return None
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             return None
         return user
 
     async def create_user(self, *, obj_in: IUserCreate, db_session: AsyncSession | None = None) -> User:
         db_session = db_session or super().get_db().session
-        password_hash = get_password_hash(obj_in.password)
-        db_obj = User(
+        password_hash = await get_password_hash_async(obj_in.password)
+        query = insert(User).values(
             name=obj_in.name,
             email=obj_in.email,
             password_hash=password_hash,
-        )
-        db_session.add(
-            db_obj
-        )
+        ).returning(User)
+        result = await db_session.execute(query)
+        db_obj = result.scalar_one()
         await db_session.commit()
-        await db_session.refresh(db_obj)
         return db_obj
 
 
+# Users written by a session are collected in session.info["users_changed"] and dropped from user_cache once
+# the transaction commits, so a reader racing the write cannot cache the old row for the TTL. None stands for
+# users changed by an UPDATE or DELETE statement, which clears the whole cache.
+@event.listens_for(Session, "after_flush")
+def collect_flushed_users(session: Session, flush_context) -> None:
+    user_ids = {obj.id for obj in [*session.dirty, *session.deleted] if isinstance(obj, User)}
+    if user_ids:
+        session.info.setdefault("users_changed", set()).update(user_ids)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def collect_user_statements(orm_execute_state: ORMExecuteState) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if any(mapper.class_ is User for mapper in orm_execute_state.all_mappers):
+        orm_execute_state.session.info.setdefault("users_changed", set()).add(None)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_cached_users(session: Session) -> None:
+    user_ids = session.info.pop("users_changed", set())
+    if None in user_ids:
+        user_cache.clear()
+        return
+    for user_id in user_ids:
+        user_cache.pop(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_changed_users(session: Session) -> None:
+    session.info.pop("users_changed", None)
+
+
 user = CRUDUser(User)
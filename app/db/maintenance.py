@@ -0,0 +1,47 @@
+"""
+Maintenance jobs against the configured database, safe to run while the app serves requests:
+
+    python -m app.db.maintenance reconcile-task-counts
+    python -m app.db.maintenance rebuild-task-stats
+"""
+import argparse
+import asyncio
+import logging
+
+from app import crud
+from app.db.session import SessionLocal, dispose_engines
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_task_counts(args: argparse.Namespace) -> None:
+    async with SessionLocal() as session:
+        fixed = await crud.task.reconcile_task_counts(batch_size=args.batch_size, db_session=session)
+    logger.info("Fixed %s task counters", fixed)
+
+
+async def rebuild_task_stats(args: argparse.Namespace) -> None:
+    async with SessionLocal() as session:
+        rebuilt = await crud.task.rebuild_task_stats(batch_size=args.batch_size, db_session=session)
+    logger.info("Rebuilt task stats of %s users", rebuilt)
+
+
+JOBS = {
+    "reconcile-task-counts": reconcile_task_counts,
+    "rebuild-task-stats": rebuild_task_stats,
+}
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        await JOBS[args.job](args)
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("job", choices=JOBS)
+    parser.add_argument("--batch-size", type=int, default=1000, help="users recounted per transaction")
+    asyncio.run(main(parser.parse_args()))
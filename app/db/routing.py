@@ -0,0 +1,86 @@
+import itertools
+import logging
+import time
+from typing import Any
+
+from asyncpg.exceptions import CannotConnectNowError, TooManyConnectionsError
+from sqlalchemy import Select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Raised while opening a connection, before the statement reached the server
+CONNECT_ERRORS = (OSError, TimeoutError, CannotConnectNowError, TooManyConnectionsError)
+
+
+class ReplicaSet:
+    """Read replicas taken in turn, leaving out for `retry_after` seconds the ones that failed to connect."""
+
+    def __init__(self, engines: list[AsyncEngine], retry_after: float):
+        self.engines = [engine.sync_engine for engine in engines]
+        self.retry_after = retry_after
+        self._failed_until: dict[Engine, float] = {}
+        self._turns = itertools.cycle(self.engines)
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self) -> Engine | None:
+        now = time.monotonic()
+        for _ in self.engines:
+            engine = next(self._turns)
+            if self._failed_until.get(engine, 0) <= now:
+                return engine
+        return None
+
+    def mark_failed(self, engine: Engine) -> None:
+        logger.warning("Read replica %s is unreachable, reading from the primary", engine.url.host)
+        self._failed_until[engine] = time.monotonic() + self.retry_after
+
+
+class RoutingSession(Session):
+    """
+    Sends plain SELECTs to a read replica and everything else to the primary. After its first write the
+    session sticks to the primary, so it always reads its own writes. A read whose replica cannot be
+    reached runs again on the primary. Subclass it setting `primary` and `replicas`.
+    """
+
+    primary: Engine
+    replicas: ReplicaSet = ReplicaSet([], retry_after=0)
+
+    def get_bind(self, mapper=None, clause=None, **kwargs) -> Engine:
+        self.info.pop("replica", None)
+        if self.replicas and not self.info.get("primary_only"):
+            if isinstance(clause, Select) and clause._for_update_arg is None:
+                replica = self.replicas.choose()
+                if replica is not None:
+                    self.info["replica"] = replica
+                    return replica
+            else:
+                self.info["primary_only"] = True
+        return self.primary
+
+    def stick_to_primary(self) -> None:
+        """Routes every following statement of the session to the primary."""
+        self.info["primary_only"] = True
+
+    def _with_fallback(self, method, *args, **kwargs) -> Any:
+        try:
+            return method(*args, **kwargs)
+        except CONNECT_ERRORS:
+            replica = self.info.pop("replica", None)
+            if replica is None:
+                raise
+            self.replicas.mark_failed(replica)
+            return method(*args, **kwargs)
+
+    def execute(self, *args, **kwargs):
+        return self._with_fallback(super().execute, *args, **kwargs)
+
+    def scalar(self, *args, **kwargs):
+        return self._with_fallback(super().scalar, *args, **kwargs)
+
+    def scalars(self, *args, **kwargs):
+        return self._with_fallback(super().scalars, *args, **kwargs)
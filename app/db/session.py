@@ -1,29 +1,87 @@
+import asyncio
+import logging
 from sqlalchemy.orm import sessionmaker
 from app.core.config import ModeEnum, settings
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
-
-DB_POOL_SIZE = 83
-WEB_CONCURRENCY = 9
-POOL_SIZE = max(DB_POOL_SIZE // WEB_CONCURRENCY, 5)
-
-connect_args = {"check_same_thread": False}
-
-engine = create_async_engine(
-    str(settings.ASYNC_DATABASE_URI),
-    echo=False,
-    poolclass=NullPool
-    if settings.MODE == ModeEnum.testing
-    else AsyncAdaptedQueuePool,  # Asincio pytest works with NullPool
-    # pool_size=POOL_SIZE,
-    # max_overflow=64,
-)
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool, QueuePool
+from app.db.routing import ReplicaSet, RoutingSession
+
+logger = logging.getLogger(__name__)
+
+
+def get_engine_args() -> dict:
+    """Engine options built from settings, shared by every engine of the app."""
+    connect_args = {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+    if settings.MODE == ModeEnum.testing:
+        # Asincio pytest works with NullPool
+        return {"echo": False, "poolclass": NullPool, "connect_args": connect_args}
+    return {
+        "echo": False,
+        "connect_args": connect_args,
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": settings.POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+engine = create_async_engine(str(settings.ASYNC_DATABASE_URI), **get_engine_args())
+replica_engines = [create_async_engine(str(uri), **get_engine_args()) for uri in settings.DATABASE_REPLICA_URIS]
+
+
+class AppRoutingSession(RoutingSession):
+    primary = engine.sync_engine
+    replicas = ReplicaSet(replica_engines, retry_after=settings.DB_REPLICA_RETRY_AFTER)
+
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=AppRoutingSession,
     expire_on_commit=False,
 )
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> int:
+    """
+    Opens up to `connections` pooled connections at once and hands them back idle, so the first requests
+    do not pay for the connection setup. Returns how many were opened, failures are left to the requests.
+    """
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return 0
+    conns = [engine.connect() for _ in range(min(connections, pool.size()))]
+    results = await asyncio.gather(*(conn.start() for conn in conns), return_exceptions=True)
+    opened = [conn for conn, result in zip(conns, results) if not isinstance(result, BaseException)]
+    await asyncio.gather(*(conn.close() for conn in opened))
+    return len(opened)
+
+
+async def warm_up_pools() -> None:
+    for db_engine in [engine, *replica_engines]:
+        opened = await warm_up_pool(db_engine, settings.DB_POOL_WARMUP)
+        logger.info("Opened %s connections to %s", opened, db_engine.url.host)
+
+
+async def dispose_engines() -> None:
+    for db_engine in [engine, *replica_engines]:
+        await db_engine.dispose()
+
+
+def get_pool_stats() -> dict[str, int]:
+    """Returns a snapshot of the engine connection pool."""
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"size": 0, "checked_out": 0, "idle": 0, "overflow": 0, "max_overflow": 0}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+    }
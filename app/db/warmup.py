@@ -0,0 +1,49 @@
+import asyncio
+import logging
+
+import anyio
+from fastapi_pagination import Params
+
+from app import crud
+from app.core.config import settings
+from app.db.session import SessionLocal, warm_up_pools
+from app.models.user_model import User
+from app.schemas.common_schema import ICursorParams
+
+logger = logging.getLogger(__name__)
+
+# Owns no rows, the statements run for their side effects only
+NOBODY = User(id=0, name="", email="", password_hash="")
+
+
+async def prepare_statements() -> None:
+    """
+    Runs the statements behind the hot endpoints once on a session, so SQLAlchemy has them compiled
+    and asyncpg has them prepared on the session's connection before the first request needs them.
+    """
+    async with SessionLocal() as session:
+        await crud.user.get_by_id(NOBODY.id, db_session=session)
+        await crud.task.get_tasks_version(NOBODY.id, db_session=session)
+        await crud.task.get_multy_tasks_paginated(params=Params(), current_user=NOBODY, db_session=session)
+        await crud.task.get_multy_tasks_paginated(
+            cursor_params=ICursorParams(), current_user=NOBODY, db_session=session
+        )
+        await crud.task.get_multy_tasks_sorted(params=Params(), current_user=NOBODY, db_session=session)
+
+
+async def warm_up() -> None:
+    """
+    Opens the pooled connections, then prepares the hot statements on as many of them. A database that
+    is not reachable yet only leaves the work to the first requests.
+    """
+    # Both import large modules on first use: anyio's asyncio backend, run by the middlewares, and the
+    # idna tables behind email validation, run on every user read from the user cache
+    await anyio.sleep(0)
+    User.model_validate({"id": NOBODY.id, "name": "", "email": "nobody@example.com", "password_hash": ""})
+    await warm_up_pools()
+    results = await asyncio.gather(
+        *(prepare_statements() for _ in range(settings.DB_POOL_WARMUP)), return_exceptions=True
+    )
+    errors = [result for result in results if isinstance(result, Exception)]
+    if errors:
+        logger.warning("Could not prepare statements at startup: %s", errors[0])
@@ -1,84 +1,27 @@
 import logging
 import traceback
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
-from fastapi_async_sqlalchemy import SQLAlchemyMiddleware
-from starlette.middleware.cors import CORSMiddleware
-from sqlalchemy.pool import NullPool
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
 
 from app.core.config import settings, ModeEnum
-from app.api.api import api_router
-from app.core.limiter import limiter
-
-app = FastAPI()
-
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-app.add_middleware(
-    SQLAlchemyMiddleware,
-    db_url=str(settings.ASYNC_DATABASE_URI),
-    engine_args={
-        "echo": False,
-        "poolclass": NullPool
-        # if settings.MODE == ModeEnum.testing
-        # else AsyncAdaptedQueuePool
-        # "pool_pre_ping": True,
-        # "pool_size": settings.POOL_SIZE,
-        # "max_overflow": 64,
-    },
-)
-
-if settings.BACKEND_CORS_ORIGINS:
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["Content-Type", "Authorization"],
-    )
-
 
-@app.middleware('http')
-async def add_security_headers(request: Request, call_next):
-    response = await call_next(request)
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["X-Frame-Options"] = "DENY"
-    csp = (
-        "default-src 'self'; "
-        "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-        "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-        "img-src 'self' https://fastapi.tiangolo.com data:; "
-        "font-src 'self' https://cdn.jsdelivr.net; "
-        "connect-src 'self'; "
-        "frame-src 'self'; "
-        "object-src 'none'; "
-        "base-uri 'self'; "
-        "form-action 'self'; "
-        "frame-ancestors 'none'; "
-        "worker-src 'self' blob:; "
-    )
-
-    if settings.MODE in [ModeEnum.development, ModeEnum.testing]:
-        response.headers["Content-Security-Policy"] = csp
-    else:
-        # In production, you might want to use a more restrictive policy
-        response.headers["Content-Security-Policy"] = "default-src 'self'"
 
-    # Allow CORS for localhost
-    response.headers["Access-Control-Allow-Origin"] = "http://localhost:8000"
-    response.headers["Access-Control-Allow-Credentials"] = "true"
-    response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-    response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.core.hashing import hashing_executor
+    from app.db.session import dispose_engines
+    from app.db.warmup import warm_up
 
-    return response
+    await warm_up()
+    yield
+    # Runs once the server has drained the in-flight requests
+    hashing_executor.shutdown()
+    await dispose_engines()
 
 
-@app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception):
     error_message = str(exc)
     error_type = type(exc).__name__
@@ -101,9 +44,78 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
     )
 
 
-@app.get("/")
 async def root():
     return {"message": "Hello World"}
 
 
-app.include_router(api_router)
+def create_app() -> FastAPI:
+    """
+    Builds the application. Routers, CRUD modules and the engine are imported here rather than at module
+    level, so importing app.main (the server's parent process, tooling) stays cheap.
+    """
+    from fastapi_async_sqlalchemy import SQLAlchemyMiddleware
+    from starlette.middleware.cors import CORSMiddleware
+    from slowapi import _rate_limit_exceeded_handler
+    from slowapi.errors import RateLimitExceeded
+
+    from app.api.api import api_router
+    from app.core.limiter import limiter
+    from app.core.security_headers import SecurityHeadersMiddleware, build_security_headers
+    from app.db.session import AppRoutingSession, engine, replica_engines
+
+    app = FastAPI(lifespan=lifespan)
+
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    app.add_middleware(
+        SQLAlchemyMiddleware,
+        custom_engine=engine,
+        session_args={"sync_session_class": AppRoutingSession},
+    )
+
+    if settings.BACKEND_CORS_ORIGINS:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["Content-Type", "Authorization"],
+        )
+
+    app.add_middleware(SecurityHeadersMiddleware, headers=build_security_headers(settings))
+    app.add_exception_handler(Exception, unhandled_exception_handler)
+    app.get("/")(root)
+    app.include_router(api_router)
+
+    if settings.MODE in [ModeEnum.development, ModeEnum.testing]:
+        from app.core.sql_accounting import QueryAccountingMiddleware, install_query_tracking
+
+        for db_engine in [engine, *replica_engines]:
+            install_query_tracking(db_engine)
+        app.add_middleware(QueryAccountingMiddleware, n_plus_one_threshold=settings.DB_N_PLUS_ONE_THRESHOLD)
+
+    if settings.HEALTH_STATS_ENABLED:
+        from app.api.endpoints import health
+
+        app.include_router(health.router, prefix="/health", tags=["health"])
+
+    if settings.METRICS_ENABLED:
+        from app.api.endpoints import metrics
+        from app.core.metrics import MetricsMiddleware, instrument_engine, rate_limit_exceeded_handler
+
+        for db_engine in [engine, *replica_engines]:
+            instrument_engine(db_engine)
+        app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics.router)
+
+    return app
+
+
+def __getattr__(name: str):
+    # `app.main:app` keeps working, the application is only built on first access
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,2 +1,4 @@
 from .user_model import User
 from .task_model import Task
+from .task_version_model import TaskVersion
+from .task_stats_model import TaskStats
@@ -1,10 +1,17 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Text, String, DateTime, Integer
+from sqlalchemy import Column, Computed, Text, String, DateTime, Integer, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlmodel import SQLModel, Field, Relationship
 from .user_model import User
 
 
 class Task(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_task_user_id_id", "user_id", "id"),
+        Index("ix_task_user_id_title_id", "user_id", "title", "id"),
+        Index("ix_task_user_id_create_at_id", "user_id", "create_at", "id"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     user_id: int = Field(Integer, foreign_key="user.id")
     title: str = Field(String, nullable=False)
@@ -13,3 +20,18 @@ class Task(SQLModel, table=True):
                                 sa_column=Column(DateTime(timezone=True), nullable=False))
 
     user: User = Relationship(back_populates="tasks")
+
+
+# Full-text search document, generated by Postgres. Added to the table only, so it is never loaded into
+# Task instances nor returned by the API.
+TASK_SEARCH_CONFIG = "english"
+Task.__table__.append_column(Column(
+    "search_vector",
+    TSVECTOR,
+    Computed(
+        f"setweight(to_tsvector('{TASK_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{TASK_SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+        persisted=True,
+    ),
+))
+Index("ix_task_search_vector", Task.__table__.c.search_vector, postgresql_using="gin")
@@ -0,0 +1,63 @@
+from datetime import date
+from sqlalchemy import BigInteger, Column, DDL, Date, ForeignKey, Integer, event
+from sqlmodel import SQLModel, Field
+
+
+class TaskStats(SQLModel, table=True):
+    """
+    Per-user, per-day (UTC) count of tasks by creation date, kept by statement-level triggers on every insert,
+    update and delete of the task table. Week and month histograms add up at most a few hundred of these rows
+    read through the primary key, instead of scanning the user's tasks.
+    """
+    __tablename__ = "task_stats"
+
+    user_id: int = Field(sa_column=Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True))
+    day: date = Field(sa_column=Column(Date, primary_key=True))
+    created: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default="0"))
+
+
+# One upsert per statement, user and day. Rows are written in key order, so concurrent statements touching
+# the same days lock them in the same order. Updates that keep user_id and create_at cancel out to nothing.
+ROLL_UP_TASK_STATS_FUNCTION = """
+CREATE OR REPLACE FUNCTION roll_up_task_stats() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        INSERT INTO task_stats (user_id, day, created)
+        SELECT user_id, day, sum(delta) FROM (
+            SELECT user_id, (create_at AT TIME ZONE 'UTC')::date AS day, 1 AS delta FROM changed_tasks
+            UNION ALL
+            SELECT user_id, (create_at AT TIME ZONE 'UTC')::date, -1 FROM old_tasks
+        ) AS moved
+        WHERE user_id IS NOT NULL GROUP BY user_id, day HAVING sum(delta) <> 0 ORDER BY user_id, day
+        ON CONFLICT (user_id, day) DO UPDATE SET created = task_stats.created + excluded.created;
+    ELSE
+        INSERT INTO task_stats (user_id, day, created)
+        SELECT user_id, (create_at AT TIME ZONE 'UTC')::date AS day,
+               CASE TG_OP WHEN 'DELETE' THEN -count(*) ELSE count(*) END
+        FROM changed_tasks
+        WHERE user_id IS NOT NULL GROUP BY user_id, day ORDER BY user_id, day
+        ON CONFLICT (user_id, day) DO UPDATE SET created = task_stats.created + excluded.created;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+TASK_STATS_TRIGGER_TABLES = {
+    "insert": "NEW TABLE AS changed_tasks",
+    "update": "OLD TABLE AS old_tasks NEW TABLE AS changed_tasks",
+    "delete": "OLD TABLE AS changed_tasks",
+}
+
+TASK_STATS_TRIGGERS = [
+    *[f"DROP TRIGGER IF EXISTS task_stats_{event_} ON task" for event_ in TASK_STATS_TRIGGER_TABLES],
+    *[
+        f"CREATE TRIGGER task_stats_{event_} AFTER {event_.upper()} ON task "
+        f"REFERENCING {tables} FOR EACH STATEMENT EXECUTE FUNCTION roll_up_task_stats()"
+        for event_, tables in TASK_STATS_TRIGGER_TABLES.items()
+    ],
+]
+
+# create_all (tests, benchmarks) gets the triggers too, migrations create them explicitly
+for statement in [ROLL_UP_TASK_STATS_FUNCTION, *TASK_STATS_TRIGGERS]:
+    event.listen(SQLModel.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -0,0 +1,62 @@
+from sqlalchemy import BigInteger, Column, DDL, ForeignKey, Integer, event
+from sqlmodel import SQLModel, Field
+
+
+class TaskVersion(SQLModel, table=True):
+    """
+    Per-user change counter and task count of the task table, kept by statement-level triggers on every
+    insert, update and delete (bulk writes and COPY included). Readers can tell nothing changed, and get
+    the total of a task list, with one primary key lookup.
+    """
+    __tablename__ = "task_version"
+
+    user_id: int = Field(sa_column=Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True))
+    version: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default="0"))
+    task_count: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default="0"))
+
+
+# One upsert per statement and user, carrying how many of the user's tasks the statement added or removed.
+# Rows are written in user_id order, so concurrent statements touching several users lock them in the same order.
+BUMP_TASK_VERSION_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_task_version() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        INSERT INTO task_version (user_id, version, task_count)
+        SELECT user_id, 1, sum(delta) FROM (
+            SELECT user_id, 1 AS delta FROM changed_tasks
+            UNION ALL
+            SELECT user_id, -1 FROM old_tasks
+        ) AS moved
+        WHERE user_id IS NOT NULL GROUP BY user_id ORDER BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET version = task_version.version + 1, task_count = task_version.task_count + excluded.task_count;
+    ELSE
+        INSERT INTO task_version (user_id, version, task_count)
+        SELECT user_id, 1, CASE TG_OP WHEN 'DELETE' THEN -count(*) ELSE count(*) END FROM changed_tasks
+        WHERE user_id IS NOT NULL GROUP BY user_id ORDER BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET version = task_version.version + 1, task_count = task_version.task_count + excluded.task_count;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+TASK_VERSION_TRIGGER_TABLES = {
+    "insert": "NEW TABLE AS changed_tasks",
+    "update": "OLD TABLE AS old_tasks NEW TABLE AS changed_tasks",
+    "delete": "OLD TABLE AS changed_tasks",
+}
+
+TASK_VERSION_TRIGGERS = [
+    *[f"DROP TRIGGER IF EXISTS task_version_{event_} ON task" for event_ in TASK_VERSION_TRIGGER_TABLES],
+    *[
+        f"CREATE TRIGGER task_version_{event_} AFTER {event_.upper()} ON task "
+        f"REFERENCING {tables} FOR EACH STATEMENT EXECUTE FUNCTION bump_task_version()"
+        for event_, tables in TASK_VERSION_TRIGGER_TABLES.items()
+    ],
+]
+
+# create_all (tests, benchmarks) gets the triggers too, migrations create them explicitly
+for statement in [BUMP_TASK_VERSION_FUNCTION, *TASK_VERSION_TRIGGERS]:
+    event.listen(SQLModel.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
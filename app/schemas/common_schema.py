@@ -1,6 +1,57 @@
+from pydantic import BaseModel, Field
 from enum import Enum
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
 
 
 class IOrderEnum(str, Enum):
     ascendant = "ascendant"
     descendent = "descendent"
+
+
+class IPoolStats(BaseModel):
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+
+
+class IHashingStats(BaseModel):
+    executor: str
+    max_workers: int
+    max_concurrency: int
+    waiting: int
+    running: int
+    completed: int
+
+
+class ICacheStats(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class IPageCacheStats(BaseModel):
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class ICursorParams(BaseModel):
+    cursor: str | None = Field(default=None, description="Opaque cursor from a previous page")
+    size: int = Field(default=50, ge=1, le=100, description="Page size")
+    include_total: bool = Field(default=False, description="Also count all matching items")
+
+
+class ICursorPage(BaseModel, Generic[T]):
+    items: list[T]
+    size: int
+    total: int | None = None
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
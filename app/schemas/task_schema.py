@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from datetime import date, datetime
 from enum import Enum
 from typing import Optional
 
@@ -9,6 +10,22 @@ class IOrderByTaskEnum(str, Enum):
     create_at = "create_at"
 
 
+class ITaskExportFormatEnum(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ITaskImportFormatEnum(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ITaskStatsBucketEnum(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+
 class ITaskBase(BaseModel):
     title: str
     description: Optional[str]
@@ -25,3 +42,44 @@ class ITaskUpdate(ITaskBase):
 class ITaskRead(ITaskBase):
     id: int
     user_id: int
+
+
+class ITaskBulkUpdate(ITaskUpdate):
+    id: int
+
+
+class ITaskBulkResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status_code: int
+    detail: Optional[str] = None
+    task: Optional[ITaskRead] = None
+
+
+class ITaskImport(ITaskCreate):
+    description: Optional[str] = None
+    create_at: Optional[datetime] = None
+
+
+class ITaskImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class ITaskImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: list[ITaskImportError]
+
+
+class ITaskStatsBucket(BaseModel):
+    start: date
+    created: int
+
+
+class ITaskStats(BaseModel):
+    bucket: ITaskStatsBucketEnum
+    from_date: date
+    to_date: date
+    total: int
+    buckets: list[ITaskStatsBucket]
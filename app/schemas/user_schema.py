@@ -59,3 +59,8 @@ class IUserRead(BaseModel):
     id: int
     name: str
     email: EmailStr
+
+
+class IUserPrincipal(BaseModel):
+    """Lightweight current user built from the token claims."""
+    id: int
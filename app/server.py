@@ -0,0 +1,55 @@
+"""
+Production entrypoint, runs uvicorn with one worker per CPU (or WEB_CONCURRENCY) and splits the
+DB_POOL_SIZE connection budget between them:
+
+    python -m app.server --host 0.0.0.0 --port 8000
+
+On SIGTERM the workers stop accepting connections, wait up to GRACEFUL_SHUTDOWN_TIMEOUT seconds for
+in-flight requests, then close their pools.
+"""
+import argparse
+import logging
+import os
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def main(args: argparse.Namespace) -> None:
+    workers = settings.WORKERS
+    if settings.WEB_CONCURRENCY > workers:
+        logger.warning(
+            "WEB_CONCURRENCY=%s lowered to %s, the most workers the DB_POOL_SIZE budget of %s holds",
+            settings.WEB_CONCURRENCY, workers, settings.DB_POOL_SIZE,
+        )
+    # Worker processes read their share of the budget from the environment
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    connections = workers * (settings.POOL_SIZE + settings.DB_MAX_OVERFLOW)
+    logger.info(
+        "Starting %s workers, %s pooled + %s overflow connections each, up to %s per database",
+        workers, settings.POOL_SIZE, settings.DB_MAX_OVERFLOW, connections,
+    )
+    if connections > settings.DB_POOL_SIZE:
+        raise SystemExit(
+            f"DB_POOL_SIZE={settings.DB_POOL_SIZE} does not fit one worker's DB_MIN_POOL_SIZE + DB_MAX_OVERFLOW"
+        )
+    uvicorn.run(
+        "app.main:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        lifespan="on",
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_TIMEOUT,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    main(parser.parse_args())
@@ -0,0 +1,48 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+
+from app.schemas.common_schema import IOrderEnum
+from app.schemas.task_schema import IOrderByTaskEnum
+
+
+class Cursor(BaseModel):
+    order_by: IOrderByTaskEnum
+    order: IOrderEnum
+    value: int | str | datetime
+    id: int
+    backwards: bool = False
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Packs the cursor into an opaque url-safe string."""
+    data = cursor.model_dump_json().encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(raw: str, order_by: IOrderByTaskEnum, order: IOrderEnum) -> Cursor:
+    """Unpacks a cursor made by encode_cursor for the same ordering."""
+    try:
+        data = base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4))
+        cursor = Cursor.model_validate(json.loads(data))
+    except (ValueError, ValidationError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor.order_by != order_by or cursor.order != order:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested ordering")
+    cursor.value = _cast_value(cursor.value, order_by)
+    return cursor
+
+
+def _cast_value(value: Any, order_by: IOrderByTaskEnum) -> Any:
+    try:
+        if order_by == IOrderByTaskEnum.id:
+            return int(value)
+        if order_by == IOrderByTaskEnum.create_at:
+            return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return str(value)
@@ -0,0 +1,43 @@
+import csv
+import io
+from typing import AsyncIterator, Sequence
+
+from app import crud
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.task_model import Task
+from app.schemas.task_schema import ITaskExportFormatEnum
+
+CSV_COLUMNS = ["id", "user_id", "title", "description", "create_at"]
+
+EXPORT_MEDIA_TYPES = {
+    ITaskExportFormatEnum.ndjson: "application/x-ndjson",
+    ITaskExportFormatEnum.csv: "text/csv",
+}
+
+
+def _to_ndjson(tasks: Sequence[Task]) -> bytes:
+    return "".join(task.model_dump_json(include=set(CSV_COLUMNS)) + "\n" for task in tasks).encode()
+
+
+def _to_csv(tasks: Sequence[Task], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(CSV_COLUMNS)
+    writer.writerows([getattr(task, name) for name in CSV_COLUMNS] for task in tasks)
+    return buffer.getvalue().encode()
+
+
+async def export_tasks(user_id: int, export_format: ITaskExportFormatEnum) -> AsyncIterator[bytes]:
+    """
+    Streams all tasks of the user, one chunk per cursor batch, so memory use does not grow with the task count.
+    Uses its own session because the request session is closed before a streamed body is sent.
+    """
+    if export_format == ITaskExportFormatEnum.csv:
+        yield _to_csv([], header=True)
+    async with SessionLocal() as db_session:
+        async for batch in crud.task.stream_users_tasks(
+                user_id, batch_size=settings.TASK_EXPORT_BATCH_SIZE, db_session=db_session
+        ):
+            yield _to_csv(batch) if export_format == ITaskExportFormatEnum.csv else _to_ndjson(batch)
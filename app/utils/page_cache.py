@@ -0,0 +1,199 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class PageCacheBackend:
+    """
+    Storage of serialized pages grouped by owner, so every page of one owner can be dropped at once.
+    Subclass it to plug in another store and return it from `get_page_cache_backend`.
+    """
+
+    def get(self, owner: int, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    def set(self, owner: int, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+    def invalidate(self, owner: int) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def size(self) -> int:
+        """Bytes currently held."""
+        raise NotImplementedError
+
+
+class MemoryPageCacheBackend(PageCacheBackend):
+    """In-process LRU bounded by the total size of the stored pages."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._bytes = 0
+        self._data: OrderedDict[tuple[int, str], bytes] = OrderedDict()
+        self._owners: dict[int, set[str]] = {}
+
+    def get(self, owner: int, key: str) -> bytes | None:
+        value = self._data.get((owner, key))
+        if value is not None:
+            self._data.move_to_end((owner, key))
+        return value
+
+    def set(self, owner: int, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        self._discard(owner, key)
+        self._data[(owner, key)] = value
+        self._owners.setdefault(owner, set()).add(key)
+        self._bytes += len(value)
+        while self._bytes > self.max_bytes:
+            self._discard(*next(iter(self._data)))
+
+    def invalidate(self, owner: int) -> None:
+        for key in list(self._owners.get(owner, ())):
+            self._discard(owner, key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._owners.clear()
+        self._bytes = 0
+
+    def size(self) -> int:
+        return self._bytes
+
+    def _discard(self, owner: int, key: str) -> None:
+        value = self._data.pop((owner, key), None)
+        if value is None:
+            return
+        self._bytes -= len(value)
+        keys = self._owners[owner]
+        keys.discard(key)
+        if not keys:
+            del self._owners[owner]
+
+
+class SQLitePageCacheBackend(PageCacheBackend):
+    """
+    Pages kept in a local SQLite file, shared by every worker process on the host. When the file grows
+    past `max_bytes` the least recently written pages go first.
+    """
+
+    TRIM_EVERY = 100
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS page_cache (owner INTEGER NOT NULL, key TEXT NOT NULL, "
+            "value BLOB NOT NULL, written REAL NOT NULL, PRIMARY KEY (owner, key)) WITHOUT ROWID"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None or getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, owner: int, key: str) -> bytes | None:
+        row = self._connection().execute(
+            "SELECT value FROM page_cache WHERE owner = ? AND key = ?", (owner, key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, owner: int, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO page_cache (owner, key, value, written) VALUES (?, ?, ?, ?)",
+            (owner, key, value, time.time()),
+        )
+        self._writes += 1
+        if self._writes % self.TRIM_EVERY == 0:
+            self._trim(connection)
+
+    def _trim(self, connection: sqlite3.Connection) -> None:
+        total = 0
+        for written, size in connection.execute(
+                "SELECT written, length(value) FROM page_cache ORDER BY written DESC"
+        ):
+            total += size
+            if total > self.max_bytes:
+                connection.execute("DELETE FROM page_cache WHERE written <= ?", (written,))
+                return
+
+    def invalidate(self, owner: int) -> None:
+        self._connection().execute("DELETE FROM page_cache WHERE owner = ?", (owner,))
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM page_cache")
+
+    def size(self) -> int:
+        return self._connection().execute("SELECT coalesce(sum(length(value)), 0) FROM page_cache").fetchone()[0]
+
+
+def get_page_cache_backend(uri: str, max_bytes: int) -> PageCacheBackend:
+    """Backend for `memory://` or `sqlite:///relative/path` and `sqlite:////absolute/path` URIs."""
+    if uri.startswith("memory://"):
+        return MemoryPageCacheBackend(max_bytes)
+    if uri.startswith("sqlite:///"):
+        return SQLitePageCacheBackend(uri[len("sqlite:///"):], max_bytes)
+    raise ValueError(f"Unsupported page cache URI: {uri}")
+
+
+class PageCache:
+    """
+    Serialized pages keyed by owner and a caller supplied key, counting hits and misses.
+    A `max_bytes` of 0 turns the cache off.
+    """
+
+    def __init__(self, backend: PageCacheBackend, max_bytes: int):
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, owner: int, key: str) -> bytes | None:
+        value = self.backend.get(owner, key) if self.enabled else None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, owner: int, key: str, value: bytes) -> None:
+        if self.enabled:
+            self.backend.set(owner, key, value)
+
+    def invalidate(self, owner: int) -> None:
+        if self.enabled:
+            self.backend.invalidate(owner)
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int | float]:
+        total = self.hits + self.misses
+        return {
+            "bytes": self.backend.size() if self.enabled else 0,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,23 @@
+from typing import Generic, TypeVar
+
+from pydantic import TypeAdapter
+
+T = TypeVar("T")
+
+
+class ResponseSerializer(Generic[T]):
+    """
+    Precompiled pydantic-core serializer for one response type.
+
+    FastAPI validates a returned value against the route's response model and then encodes it with the
+    stdlib json module. `serializer.dump(value)` instead writes JSON bytes straight from the trusted ORM
+    objects in one pass; the task list routes cache those bytes with crud.task.get_cached_page and return
+    them as a plain Response. Declare `response_model` on the route to keep the OpenAPI schema.
+    """
+
+    def __init__(self, type_: type[T]):
+        self.adapter = TypeAdapter(type_)
+
+    def dump(self, content: T) -> bytes:
+        return self.adapter.dump_json(content)
+
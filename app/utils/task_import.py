@@ -0,0 +1,121 @@
+import codecs
+import csv
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.schemas.task_schema import ITaskImport, ITaskImportError, ITaskImportFormatEnum
+
+IMPORT_COLUMNS = ["title", "description", "create_at"]
+
+
+class TaskImportParser:
+    """
+    Turns an uploaded NDJSON or CSV body into validated tasks while it streams in, so the upload is never
+    held in memory as a whole. Lines that fail validation are counted and reported, not imported.
+    CSV needs a header row with at least a `title` column; quoted fields may span several lines.
+    """
+
+    def __init__(self, import_format: ITaskImportFormatEnum, max_errors: int, max_line_length: int):
+        self.import_format = import_format
+        self.max_errors = max_errors
+        self.max_line_length = max_line_length
+        self.failed = 0
+        self.errors: list[ITaskImportError] = []
+        self._header: list[str] | None = None
+
+    async def parse(self, stream: AsyncIterator[bytes]) -> AsyncIterator[ITaskImport]:
+        parse_record = self._parse_csv if self.import_format == ITaskImportFormatEnum.csv else self._parse_ndjson
+        async for line, record in self._records(stream):
+            task = parse_record(line, record)
+            if task is not None:
+                yield task
+
+    async def _records(self, stream: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str]]:
+        """Complete records with the number of the line they start on."""
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        buffer = ""
+        record = ""
+        start = line_number = 0
+        async for chunk in self._decoded(stream, decoder):
+            buffer += chunk
+            *lines, buffer = buffer.split("\n")
+            if len(buffer) > self.max_line_length:
+                raise HTTPException(status_code=413, detail=f"Line {line_number + 1} is too long")
+            for line in lines:
+                line_number += 1
+                if not record:
+                    start = line_number
+                record += line + "\n"
+                # An odd number of quotes leaves a CSV field open, the record goes on on the next line
+                if self.import_format == ITaskImportFormatEnum.csv and record.count('"') % 2:
+                    if len(record) > self.max_line_length:
+                        raise HTTPException(status_code=413, detail=f"Record on line {start} is too long")
+                    continue
+                yield start, record
+                record = ""
+        if buffer or record:
+            yield start if record else line_number + 1, record + buffer
+
+    @staticmethod
+    async def _decoded(stream: AsyncIterator[bytes], decoder: codecs.IncrementalDecoder) -> AsyncIterator[str]:
+        try:
+            async for chunk in stream:
+                yield decoder.decode(chunk)
+            yield decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="The upload is not valid UTF-8")
+
+    def _parse_ndjson(self, line: int, record: str) -> ITaskImport | None:
+        if not record.strip():
+            return None
+        try:
+            return self._checked(ITaskImport.model_validate_json(record))
+        except ValidationError as error:
+            self._fail(line, error)
+        except ValueError as error:
+            self._fail(line, str(error))
+        return None
+
+    def _parse_csv(self, line: int, record: str) -> ITaskImport | None:
+        if not record.strip():
+            return None
+        try:
+            row = next(csv.reader([record.rstrip("\r\n")]))
+        except csv.Error as error:
+            self._fail(line, f"Invalid CSV: {error}")
+            return None
+        if self._header is None:
+            if "title" not in row:
+                raise HTTPException(status_code=400, detail="The CSV header must have a title column")
+            self._header = row
+            return None
+        if len(row) != len(self._header):
+            self._fail(line, f"Expected {len(self._header)} fields, got {len(row)}")
+            return None
+        data = {name: value or None for name, value in zip(self._header, row) if name in IMPORT_COLUMNS}
+        data["title"] = data.get("title") or ""
+        try:
+            return self._checked(ITaskImport.model_validate(data))
+        except ValidationError as error:
+            self._fail(line, error)
+        except ValueError as error:
+            self._fail(line, str(error))
+        return None
+
+    @staticmethod
+    def _checked(task: ITaskImport) -> ITaskImport:
+        # Postgres text cannot hold NUL, COPY would abort the whole import
+        if "\x00" in task.title or (task.description and "\x00" in task.description):
+            raise ValueError("Text must not contain NUL characters")
+        return task
+
+    def _fail(self, line: int, error: ValidationError | str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            if isinstance(error, ValidationError):
+                error = "; ".join(
+                    f"{'.'.join(map(str, item['loc'])) or 'line'}: {item['msg']}" for item in error.errors()
+                )
+            self.errors.append(ITaskImportError(line=line, detail=error))
@@ -0,0 +1,87 @@
+"""
+Measures GET /task latency while a storm of logins is hashing passwords.
+
+The same run is repeated with hashing done inline on the event loop (the old behaviour) and
+through the hashing executor, so the two latency profiles can be compared side by side.
+Needs a migrated database configured through the usual settings:
+
+    python -m benchmarks.bench_login_storm --logins 40 --requests 100
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from httpx import ASGITransport, AsyncClient
+
+from app.core.hashing import hashing_executor
+from app.main import app
+
+PASSWORD = "Bench12@password"
+
+
+async def run_inline(func, *args):
+    return func(*args)
+
+
+def percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+async def measure_tasks(client: AsyncClient, token: str, requests: int) -> list[float]:
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await client.get("/task", headers={"Authorization": f"Bearer {token}"})
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.text
+        await asyncio.sleep(0)
+    return latencies
+
+
+async def login_storm(client: AsyncClient, email: str, logins: int) -> None:
+    responses = await asyncio.gather(*[
+        client.post("/auth/login", json={"email": email, "password": PASSWORD}) for _ in range(logins)
+    ])
+    assert all(response.status_code == 200 for response in responses)
+
+
+async def run(client: AsyncClient, email: str, token: str, args: argparse.Namespace) -> dict[str, list[float]]:
+    quiet = await measure_tasks(client, token, args.requests)
+    storm = asyncio.create_task(login_storm(client, email, args.logins))
+    await asyncio.sleep(0)
+    during = await measure_tasks(client, token, args.requests)
+    await storm
+    return {"quiet": quiet, "storm": during}
+
+
+def report(mode: str, results: dict[str, list[float]]) -> None:
+    for phase, latencies in results.items():
+        print(f"{mode:<9} {phase:<6} p50={percentile(latencies, 50):8.2f}ms "
+              f"p95={percentile(latencies, 95):8.2f}ms max={max(latencies):8.2f}ms")
+
+
+async def main(args: argparse.Namespace) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+        response = await client.post("/auth/register", json={"name": "bench", "email": email, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        token = response.json()["Token"]
+
+        executor_run = hashing_executor.run
+        hashing_executor.run = run_inline
+        try:
+            report("inline", await run(client, email, token, args))
+        finally:
+            hashing_executor.run = executor_run
+        report("executor", await run(client, email, token, args))
+        print(f"hashing stats: {hashing_executor.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40, help="concurrent logins in the storm")
+    parser.add_argument("--requests", type=int, default=100, help="GET /task requests per phase")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,129 @@
+"""
+Compares finding tasks the way clients do today (download every task of the user to grep locally), an
+unindexed ILIKE query, and the indexed full-text search behind GET /task/search, on a table seeded
+server-side to millions of rows spread over many users. Needs the configured local PostgreSQL:
+
+    python -m benchmarks.bench_search --rows 2000000 --users 200 --queries 100
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from fastapi_pagination import Page, Params
+from sqlalchemy import ARRAY, Integer, String, bindparam, func, or_, select, text
+from sqlmodel import SQLModel
+
+from app import crud
+from app.db.session import SessionLocal, engine
+from app.models.task_model import Task
+from app.utils.serialization import ResponseSerializer
+from benchmarks.seed import seed
+
+COMMON_WORDS = [
+    "report", "invoice", "meeting", "groceries", "dentist", "backup", "deploy", "review", "budget", "garden",
+    "laundry", "birthday", "flight", "hotel", "passport", "insurance", "taxes", "renew", "car", "service",
+    "plumber", "paint", "kitchen", "bedroom", "garage", "newsletter", "release", "migration", "database",
+    "index", "coffee", "bread", "milk", "vegetables", "fruit", "doctor", "pharmacy", "gym", "yoga", "swim",
+]
+SYLLABLES = ["ba", "ce", "di", "fo", "gu", "ka", "le", "mi", "no", "pu", "ra", "se", "ti", "vo", "zu", "ha"]
+# A few thousand words, the first ones far more frequent than the rest (see WORD_SKEW), like real text
+WORDS = COMMON_WORDS + [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES]
+WORD_SKEW = 2
+INSERT_CHUNK = 500_000
+# The description subquery refers to i, so Postgres runs it again for every task
+SEED_SQL = text(
+    "INSERT INTO task (user_id, title, description, create_at) "
+    "SELECT (:user_ids)[1 + i % cardinality(:user_ids)], "
+    "(:words)[1 + floor(power(random(), CAST(:skew AS FLOAT)) * cardinality(:words))::int] || ' ' "
+    "|| (:words)[1 + floor(power(random(), CAST(:skew AS FLOAT)) * cardinality(:words))::int], "
+    "array_to_string(ARRAY(SELECT (:words)[1 + floor(power(random(), CAST(:skew AS FLOAT)) * cardinality(:words))::int] "
+    "FROM generate_series(1, 8) WHERE i IS NOT NULL), ' '), "
+    "now() - i * interval '1 second' "
+    "FROM generate_series(CAST(:start AS INTEGER), CAST(:stop AS INTEGER) - 1) AS i"
+).bindparams(bindparam("user_ids", type_=ARRAY(Integer)), bindparam("words", type_=ARRAY(String)))
+
+page_serializer = ResponseSerializer(Page[Task])
+list_serializer = ResponseSerializer(list[Task])
+
+
+async def fill(user_ids: list[int], rows: int) -> None:
+    """Tops the benchmark users up to `rows` tasks in total, generated by Postgres itself."""
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with engine.connect() as conn:
+        existing = await conn.scalar(select(func.count()).select_from(Task).where(Task.user_id.in_(user_ids)))
+        await conn.execute(text("SELECT setseed(0.42)"))
+        for start in range(existing, rows, INSERT_CHUNK):
+            stop = min(start + INSERT_CHUNK, rows)
+            await conn.execute(SEED_SQL, {
+                "user_ids": user_ids, "words": WORDS, "skew": float(WORD_SKEW), "start": start, "stop": stop
+            })
+            await conn.commit()
+            print(f"seeded {stop}/{rows} rows")
+        await conn.execute(text("ANALYZE task"))
+        await conn.commit()
+
+
+async def download_all(session, user, q: str) -> int:
+    tasks = await crud.task.get_users_tasks_by_id(user.id, db_session=session)
+    content = list_serializer.dump(tasks)
+    return len(content)
+
+
+async def ilike(session, user, q: str) -> int:
+    query = select(Task).where(Task.user_id == user.id)
+    for word in q.split():
+        query = query.where(or_(Task.title.ilike(f"%{word}%"), Task.description.ilike(f"%{word}%")))
+    params = Params(size=20)
+    items = (await session.scalars(query.order_by(Task.id).limit(params.size))).all()
+    total = await session.scalar(select(func.count()).select_from(query.subquery()))
+    return len(page_serializer.dump(Page[Task].create(items, params=params, total=total)))
+
+
+async def full_text(session, user, q: str) -> int:
+    page = await crud.task.search_tasks(q=q, params=Params(size=20), current_user=user, db_session=session)
+    return len(page_serializer.dump(page))
+
+
+async def measure(name: str, func, users, queries: list[str]) -> None:
+    timings, sizes = [], []
+    async with SessionLocal() as session:
+        for q in queries:
+            user = random.choice(users)
+            start = time.perf_counter()
+            sizes.append(await func(session, user, q))
+            timings.append((time.perf_counter() - start) * 1000)
+            session.expunge_all()
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{name:<18} p50 {statistics.median(timings):8.1f} ms  p95 {p95:8.1f} ms  "
+        f"{statistics.mean(sizes) / 1024:9.1f} KiB/response"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    users = await seed(args.users, 0)
+    await fill([user.id for user in users], args.rows)
+    rng = random.Random(7)
+    queries = [
+        " ".join(WORDS[int(rng.random() ** WORD_SKEW * len(WORDS))] for _ in range(rng.choice([1, 1, 2])))
+        for _ in range(args.queries)
+    ]
+    print(f"{args.rows} rows, {args.rows // args.users} tasks per user, {args.queries} queries")
+    random.seed(1)
+    await measure("download all", download_all, users, queries[:max(args.queries // 10, 5)])
+    random.seed(1)
+    await measure("ilike", ilike, users, queries)
+    random.seed(1)
+    await measure("full-text search", full_text, users, queries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
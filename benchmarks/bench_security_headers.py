@@ -0,0 +1,86 @@
+"""
+Per-request cost of the previous `@app.middleware('http')` security headers function against the
+precomputed SecurityHeadersMiddleware, calling bare ASGI apps directly so only the middleware
+differs. No database needed:
+
+    python -m benchmarks.bench_security_headers --iterations 20000
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import ModeEnum, settings
+from app.core.security_headers import DEVELOPMENT_CSP, SecurityHeadersMiddleware, build_security_headers
+
+
+async def legacy_add_security_headers(request: Request, call_next):
+    response = await call_next(request)
+    response.headers["X-XSS-Protection"] = "1; mode=block"
+    response.headers["X-Frame-Options"] = "DENY"
+    csp = DEVELOPMENT_CSP
+    if settings.MODE in [ModeEnum.development, ModeEnum.testing]:
+        response.headers["Content-Security-Policy"] = csp
+    else:
+        response.headers["Content-Security-Policy"] = "default-src 'self'"
+    response.headers["Access-Control-Allow-Origin"] = "http://localhost:8000"
+    response.headers["Access-Control-Allow-Credentials"] = "true"
+    response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
+    response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+    return response
+
+
+def make_app(kind: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/")
+    async def root():
+        return PlainTextResponse("ok")
+
+    if kind == "legacy":
+        app.middleware("http")(legacy_add_security_headers)
+    elif kind == "asgi":
+        app.add_middleware(SecurityHeadersMiddleware, headers=build_security_headers(settings))
+    return app
+
+
+async def call(app: FastAPI) -> None:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/", "raw_path": b"/", "root_path": "", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 1234), "server": ("test", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def timed(name: str, app: FastAPI, iterations: int) -> float:
+    for _ in range(100):
+        await call(app)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await call(app)
+    per_request = (time.perf_counter() - start) / iterations * 1_000_000
+    print(f"{name:<8} {per_request:8.1f} us/request")
+    return per_request
+
+
+async def main(args: argparse.Namespace) -> None:
+    baseline = await timed("none", make_app("none"), args.iterations)
+    legacy = await timed("legacy", make_app("legacy"), args.iterations)
+    asgi = await timed("asgi", make_app("asgi"), args.iterations)
+    print(f"middleware overhead: legacy {legacy - baseline:.1f} us, asgi {asgi - baseline:.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    asyncio.run(main(parser.parse_args()))
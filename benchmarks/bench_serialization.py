@@ -0,0 +1,63 @@
+"""
+Compares the default FastAPI response path (validate against the response model, then encode with
+the stdlib json module) with the precompiled ResponseSerializer for a Page[Task]. No database needed:
+
+    python -m benchmarks.bench_serialization --items 100 --iterations 2000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from fastapi_pagination import Page, Params
+
+from app.models.task_model import Task
+from app.utils.serialization import ResponseSerializer
+
+
+def make_page(items: int) -> Page[Task]:
+    now = datetime.now(timezone.utc)
+    tasks = [
+        Task(id=i, user_id=1, title=f"task {i}", description=f"description of task {i}" * 3, create_at=now)
+        for i in range(items)
+    ]
+    return Page[Task].create(tasks, params=Params(page=1, size=items), total=items * 10)
+
+
+async def default_path(field, page: Page[Task]) -> bytes:
+    content = await serialize_response(field=field, response_content=page)
+    return JSONResponse(content).body
+
+
+async def serializer_path(serializer: ResponseSerializer, page: Page[Task]) -> bytes:
+    return Response(serializer.dump(page), media_type="application/json").body
+
+
+async def timed(name: str, func, iterations: int) -> float:
+    await func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    per_call = (time.perf_counter() - start) / iterations * 1_000_000
+    print(f"{name:<12} {per_call:10.1f} us/response")
+    return per_call
+
+
+async def main(args: argparse.Namespace) -> None:
+    page = make_page(args.items)
+    field = create_model_field(name="Response_get_task", type_=Page[Task], mode="serialization")
+    serializer = ResponseSerializer(Page[Task])
+    default = await timed("default", lambda: default_path(field, page), args.iterations)
+    fast = await timed("serializer", lambda: serializer_path(serializer, page), args.iterations)
+    print(f"speedup      {default / fast:10.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100, help="tasks per page")
+    parser.add_argument("--iterations", type=int, default=2000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,76 @@
+"""
+Measures the cold start of a worker in fresh interpreter processes: importing app.main, create_app(),
+the lifespan warm-up and the first authenticated requests, against the configured local PostgreSQL.
+Each phase is reported as the median over --runs processes:
+
+    python -m benchmarks.bench_startup --runs 10
+    python -m benchmarks.bench_startup --runs 10 --warmup 0   # without the lifespan warm-up
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PATHS = ["/task", "/task/sorted", "/task/cursor"]
+
+
+async def child(user_id: int) -> None:
+    start = time.perf_counter()
+    import app.main
+    imported = time.perf_counter()
+    application = app.main.create_app()
+    created = time.perf_counter()
+
+    from httpx import ASGITransport, AsyncClient
+    from app.core.limiter import limiter
+    from app.core.security import create_access_token
+
+    limiter.enabled = False
+    timings = {"import": imported - start, "create_app": created - imported}
+    headers = {"Authorization": f"Bearer {create_access_token(user_id)}"}
+    started = time.perf_counter()
+    async with application.router.lifespan_context(application):
+        timings["startup"] = time.perf_counter() - started
+        transport = ASGITransport(app=application)
+        async with AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+            for label in ["first", "second"]:
+                for path in PATHS:
+                    request_start = time.perf_counter()
+                    response = await client.get(path)
+                    assert response.status_code == 200, response.text
+                    timings[f"{label} {path}"] = time.perf_counter() - request_start
+    print(json.dumps({name: seconds * 1000 for name, seconds in timings.items()}))
+
+
+def main(args: argparse.Namespace) -> None:
+    from benchmarks.seed import seed
+
+    user = asyncio.run(seed(1, 100))[0]
+    env = {**os.environ, "DB_POOL_WARMUP": str(args.warmup), "TASK_CACHE_MAX_BYTES": "0"}
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_startup", "--child", str(user.id)],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    print(f"{args.runs} runs, DB_POOL_WARMUP={args.warmup}")
+    for phase in runs[0]:
+        values = [run[phase] for run in runs]
+        print(f"{phase:<22} median {statistics.median(values):8.1f} ms  max {max(values):8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=5, help="DB_POOL_WARMUP of the measured processes")
+    parser.add_argument("--child", type=int, metavar="USER_ID", help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    if arguments.child is not None:
+        asyncio.run(child(arguments.child))
+    else:
+        main(arguments)
@@ -0,0 +1,106 @@
+"""
+Per-call cost of the hot CRUD queries written as ad hoc constructs (how they were built on every call) and
+as the precompiled statements in app.crud. Reports the Python-side cost of producing the statement and its
+compiled-cache key, and the full round trip against the configured local PostgreSQL, where the database
+work is identical for both variants:
+
+    python -m benchmarks.bench_statements --iterations 2000
+    python -m benchmarks.bench_statements --iterations 2000 --prepared-cache 0   # asyncpg cache off
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import Callable
+
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+
+
+Query = Callable[[], tuple[Select, dict]]
+
+
+def adhoc_queries(Task, TaskVersion, User, user_id: int, task_id: int, email: str) -> dict[str, Query]:
+    return {
+        "task by id": lambda: (select(Task).where(Task.id == task_id), {}),
+        "user by id": lambda: (select(User).where(User.id == user_id), {}),
+        "user by email": lambda: (select(User).where(User.email == email), {}),
+        "sorted page": lambda: (
+            select(Task).where(Task.user_id == user_id).order_by(Task.title.desc()).limit(50).offset(50), {}
+        ),
+        "task counters": lambda: (
+            select(TaskVersion.version, TaskVersion.task_count).where(TaskVersion.user_id == user_id), {}
+        ),
+    }
+
+
+def precompiled_queries(user_id: int, task_id: int, email: str) -> dict[str, Query]:
+    from app import crud
+    from app.crud.task_crud import SORTED_USER_TASK_PAGES, TASK_BY_ID, TASK_COUNTERS
+    from app.crud.user_crud import USER_BY_EMAIL
+    from app.schemas.task_schema import IOrderByTaskEnum
+
+    sorted_page = SORTED_USER_TASK_PAGES[IOrderByTaskEnum.title, False]
+    return {
+        "task by id": lambda: (TASK_BY_ID, {"task_id": task_id}),
+        "user by id": lambda: (crud.user._by_id, {"id": user_id}),
+        "user by email": lambda: (USER_BY_EMAIL, {"email": email}),
+        "sorted page": lambda: (sorted_page, {"user_id": user_id, "limit": 50, "offset": 50}),
+        "task counters": lambda: (TASK_COUNTERS, {"user_id": user_id}),
+    }
+
+
+def build_cost(query: Query, iterations: int) -> float:
+    """Microseconds to get the statement and its cache key, the part precompiling removes."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        statement, _params = query()
+        statement._generate_cache_key()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+async def round_trip(session, query: Query, iterations: int) -> float:
+    for _ in range(50):
+        statement, params = query()
+        (await session.execute(statement, params)).all()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        statement, params = query()
+        (await session.execute(statement, params)).all()
+    session.expunge_all()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+async def main(args: argparse.Namespace) -> None:
+    from app.db.session import SessionLocal
+    from app.models.task_model import Task
+    from app.models.task_version_model import TaskVersion
+    from app.models.user_model import User
+    from benchmarks.seed import bench_email, seed
+
+    user = (await seed(1, 200))[0]
+    async with SessionLocal() as session:
+        task_id = (await session.scalars(select(Task.id).where(Task.user_id == user.id).limit(1))).one()
+
+        adhoc = adhoc_queries(Task, TaskVersion, User, user.id, task_id, bench_email(0))
+        precompiled = precompiled_queries(user.id, task_id, bench_email(0))
+        print(f"prepared statement cache {os.environ['DB_PREPARED_STATEMENT_CACHE_SIZE']}, microseconds per call")
+        print(f"{'':<14} {'statement + cache key':>30} {'round trip':>30}")
+        for name in adhoc:
+            build = build_cost(adhoc[name], args.iterations), build_cost(precompiled[name], args.iterations)
+            trip = (
+                await round_trip(session, adhoc[name], args.iterations),
+                await round_trip(session, precompiled[name], args.iterations),
+            )
+            print(f"{name:<14} ad hoc {build[0]:7.1f}  precompiled {build[1]:5.1f}  "
+                  f"ad hoc {trip[0]:7.1f}  precompiled {trip[1]:7.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--prepared-cache", type=int, default=500, help="DB_PREPARED_STATEMENT_CACHE_SIZE")
+    arguments = parser.parse_args()
+    # Read when app.db.session creates the engine, so it has to be set before the first app import
+    os.environ["DB_PREPARED_STATEMENT_CACHE_SIZE"] = str(arguments.prepared_cache)
+    asyncio.run(main(arguments))
@@ -0,0 +1,128 @@
+"""
+Counts database round trips and time per task write, comparing the previous read-modify-write
+implementation (SELECT, then UPDATE/DELETE, COMMIT and a refresh SELECT) with the current
+single-statement CRUDTasks methods. BEGIN, COMMIT and ROLLBACK count as round trips; the legacy
+refresh opens a transaction that the following operation reuses, so compare the sum of a
+create/update/remove cycle. Needs a migrated database configured through the usual settings:
+
+    python -m benchmarks.bench_write_round_trips --iterations 200
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from contextlib import contextmanager
+
+from sqlalchemy import event, select
+
+from app import crud
+from app.db.session import SessionLocal, engine
+from app.models.task_model import Task
+from app.schemas.task_schema import ITaskCreate, ITaskUpdate
+from app.schemas.user_schema import IUserCreate
+
+
+@contextmanager
+def count_round_trips():
+    counter = {"round_trips": 0}
+
+    def on_round_trip(*args, **kwargs):
+        counter["round_trips"] += 1
+
+    events = ["before_cursor_execute", "begin", "commit", "rollback"]
+    for name in events:
+        event.listen(engine.sync_engine, name, on_round_trip)
+    try:
+        yield counter
+    finally:
+        for name in events:
+            event.remove(engine.sync_engine, name, on_round_trip)
+
+
+async def legacy_create(session, user, new_task: ITaskCreate) -> Task:
+    task = Task(**new_task.dict(), user_id=user.id)
+    session.add(task)
+    await session.commit()
+    await session.refresh(task)
+    return task
+
+
+async def legacy_update(session, user, task_id: int, new_data: ITaskUpdate) -> Task:
+    task = await session.scalar(select(Task).where(Task.id == task_id))
+    assert task.user_id == user.id
+    for key, value in new_data.dict(exclude_unset=True).items():
+        setattr(task, key, value)
+    session.add(task)
+    await session.commit()
+    await session.refresh(task)
+    return task
+
+
+async def legacy_remove(session, user, task_id: int) -> None:
+    task = await session.scalar(select(Task).where(Task.id == task_id))
+    assert task.user_id == user.id
+    await session.delete(task)
+    await session.commit()
+
+
+async def current_create(session, user, new_task: ITaskCreate) -> Task:
+    return await crud.task.create_task(new_task, user, db_session=session)
+
+
+async def current_update(session, user, task_id: int, new_data: ITaskUpdate) -> Task:
+    return await crud.task.update_task(task_id, new_data, current_user=user, db_session=session)
+
+
+async def current_remove(session, user, task_id: int) -> None:
+    await crud.task.remove_task(task_id, current_user=user, db_session=session)
+
+
+IMPLEMENTATIONS = {
+    "legacy": (legacy_create, legacy_update, legacy_remove),
+    "current": (current_create, current_update, current_remove),
+}
+
+
+async def run(name: str, user, iterations: int) -> None:
+    create, update_, remove = IMPLEMENTATIONS[name]
+    totals = {"create": [0, 0.0], "update": [0, 0.0], "remove": [0, 0.0]}
+    async with SessionLocal() as session:
+        for i in range(iterations):
+            with count_round_trips() as counter:
+                start = time.perf_counter()
+                task = await create(session, user, ITaskCreate(title=f"bench {i}", description=None))
+                totals["create"][1] += time.perf_counter() - start
+            totals["create"][0] += counter["round_trips"]
+
+            with count_round_trips() as counter:
+                start = time.perf_counter()
+                await update_(session, user, task.id, ITaskUpdate(title=f"bench {i} updated", description="x"))
+                totals["update"][1] += time.perf_counter() - start
+            totals["update"][0] += counter["round_trips"]
+
+            with count_round_trips() as counter:
+                start = time.perf_counter()
+                await remove(session, user, task.id)
+                totals["remove"][1] += time.perf_counter() - start
+            totals["remove"][0] += counter["round_trips"]
+
+    for operation, (round_trips, seconds) in totals.items():
+        print(f"{name:<8} {operation:<7} round trips/op={round_trips / iterations:5.2f} "
+              f"avg={seconds / iterations * 1000:7.3f}ms")
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with SessionLocal() as session:
+        user = await crud.user.create_user(
+            obj_in=IUserCreate(name="bench", email=f"bench-{uuid.uuid4().hex[:8]}@example.com",
+                               password="Bench12@password"),
+            db_session=session,
+        )
+    for name in IMPLEMENTATIONS:
+        await run(name, user, args.iterations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,157 @@
+"""
+HTTP load runner for the real app.main:app, served in-process through an ASGI transport against
+the configured (local) Postgres. Runs a weighted scenario mix with a number of concurrent virtual
+users and reports throughput and p50/p95/p99 per scenario. Results can be saved as a baseline and
+later runs compared with it:
+
+    python -m benchmarks.load --mix mixed --duration 30 --concurrency 20 --save benchmarks/baselines/mixed.json
+    python -m benchmarks.load --mix mixed --duration 30 --concurrency 20 --compare benchmarks/baselines/mixed.json
+
+Rate limits are switched off unless --keep-rate-limits is given, so they do not skew the numbers.
+The run exits with status 1 when a scenario's p95 or throughput regresses beyond --tolerance.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient, HTTPError
+
+from app.core.limiter import limiter
+from app.main import app
+from app.utils.token import generate_token
+from benchmarks.scenarios import MIXES, SCENARIOS, VirtualUser
+from benchmarks.seed import seed
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+async def worker(client: AsyncClient, user: VirtualUser, mix: dict[str, int], deadline: float,
+                 latencies: dict[str, list[float]], errors: dict[str, int]) -> None:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    while time.perf_counter() < deadline:
+        name = user.rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            await SCENARIOS[name](client, user)
+        except (AssertionError, HTTPError):
+            # Unexpected status or a transport error/timeout, the run goes on and counts a failed request
+            errors[name] += 1
+            continue
+        latencies[name].append((time.perf_counter() - start) * 1000)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    users = await seed(args.users, args.tasks_per_user)
+    limiter.enabled = args.keep_rate_limits
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=60) as client:
+        virtual_users = [
+            VirtualUser(
+                email=users[i % len(users)].email,
+                token=generate_token(users[i % len(users)]).access_token,
+                rng=random.Random(args.seed + i),
+            ) for i in range(args.concurrency)
+        ]
+        await asyncio.gather(*[
+            worker(client, user, MIXES[args.mix], time.perf_counter() + args.warmup, defaultdict(list),
+                   defaultdict(int)) for user in virtual_users
+        ])
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            worker(client, user, MIXES[args.mix], started + args.duration, latencies, errors)
+            for user in virtual_users
+        ])
+        elapsed = time.perf_counter() - started
+
+    return {
+        "config": {
+            "mix": args.mix,
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "tasks_per_user": args.tasks_per_user,
+        },
+        "scenarios": {
+            name: {
+                "requests": len(values),
+                "errors": errors[name],
+                "throughput": len(values) / elapsed,
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+            } for name, values in sorted(latencies.items())
+        },
+    }
+
+
+def report(results: dict) -> None:
+    print(f"{'scenario':<16}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in results["scenarios"].items():
+        print(f"{name:<16}{stats['requests']:>10}{stats['errors']:>8}{stats['throughput']:>10.1f}"
+              f"{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Returns a message for every scenario that regressed beyond the tolerance."""
+    regressions = []
+    if results["config"] != baseline["config"]:
+        print(f"warning: run config {results['config']} differs from baseline {baseline['config']}")
+    for name, expected in baseline["scenarios"].items():
+        actual = results["scenarios"].get(name)
+        if actual is None:
+            regressions.append(f"{name}: missing from this run")
+            continue
+        if actual["p95"] > expected["p95"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {actual['p95']:.2f}ms vs baseline {expected['p95']:.2f}ms")
+        if actual["throughput"] < expected["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {actual['throughput']:.1f}/s vs baseline {expected['throughput']:.1f}/s"
+            )
+        if actual["errors"] > expected["errors"]:
+            regressions.append(f"{name}: {actual['errors']} errors vs baseline {expected['errors']}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--duration", type=float, default=30, help="seconds measured")
+    parser.add_argument("--warmup", type=float, default=3, help="seconds run before measuring")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--users", type=int, default=10, help="seeded users")
+    parser.add_argument("--tasks-per-user", type=int, default=1000, help="seeded tasks per user")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the scenario choice")
+    parser.add_argument("--keep-rate-limits", action="store_true")
+    parser.add_argument("--save", type=Path, help="write the results to this baseline file")
+    parser.add_argument("--compare", type=Path, help="compare the results with this baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    report(results)
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(results, indent=2) + "\n")
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Request scenarios used by the load runner. Every scenario issues the requests of one user action
+against the in-process app and raises AssertionError on an unexpected status code.
+"""
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from httpx import AsyncClient
+
+from benchmarks.seed import PASSWORD, SEED_START
+
+
+@dataclass
+class VirtualUser:
+    email: str
+    token: str
+    rng: random.Random
+    task_ids: list[int] = field(default_factory=list)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+def expect(response, status_code: int = 200) -> None:
+    assert response.status_code == status_code, f"{response.request.url}: {response.status_code} {response.text}"
+
+
+async def register_login(client: AsyncClient, user: VirtualUser) -> None:
+    email = f"bench-{uuid.uuid4().hex}@example.com"
+    expect(await client.post("/auth/register", json={"name": "bench", "email": email, "password": PASSWORD}))
+    expect(await client.post("/auth/login", json={"email": email, "password": PASSWORD}))
+
+
+async def crud_cycle(client: AsyncClient, user: VirtualUser) -> None:
+    response = await client.post("/task", json={"title": "load", "description": "load test"}, headers=user.headers)
+    expect(response, 201)
+    task_id = response.json()["id"]
+    expect(await client.put("/task", params={"id": task_id}, json={"title": "load updated", "description": None},
+                            headers=user.headers))
+    expect(await client.delete("/task", params={"id": task_id}, headers=user.headers), 204)
+
+
+async def paginate(client: AsyncClient, user: VirtualUser) -> None:
+    page = user.rng.randint(1, 20)
+    expect(await client.get("/task", params={"page": page, "size": 50}, headers=user.headers))
+
+
+async def filter_by_date(client: AsyncClient, user: VirtualUser) -> None:
+    from_date = SEED_START.date() + timedelta(days=user.rng.randint(0, 20))
+    params = {"from_date": from_date.isoformat(), "to_date": (from_date + timedelta(days=7)).isoformat(), "size": 50}
+    expect(await client.get("/task/filtered", params=params, headers=user.headers))
+
+
+async def sort(client: AsyncClient, user: VirtualUser) -> None:
+    params = {
+        "order_by": user.rng.choice(["id", "title", "create_at"]),
+        "order": user.rng.choice(["ascendant", "descendent"]),
+        "page": user.rng.randint(1, 10),
+        "size": 50,
+    }
+    expect(await client.get("/task/sorted", params=params, headers=user.headers))
+
+
+SCENARIOS = {
+    "register_login": register_login,
+    "crud": crud_cycle,
+    "paginate": paginate,
+    "filter": filter_by_date,
+    "sort": sort,
+}
+
+# Relative weights of the scenarios in each mix
+MIXES: dict[str, dict[str, int]] = {
+    "auth": {"register_login": 1},
+    "crud": {"crud": 1},
+    "read": {"paginate": 4, "filter": 2, "sort": 2},
+    "mixed": {"register_login": 1, "crud": 5, "paginate": 40, "filter": 20, "sort": 20},
+}
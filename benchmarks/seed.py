@@ -0,0 +1,63 @@
+"""
+Seeds the configured database with benchmark users and tasks. Idempotent: users that already hold
+the requested number of tasks are left alone.
+
+    python -m benchmarks.seed --users 10 --tasks-per-user 1000
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, select
+from sqlmodel import SQLModel
+
+from app import crud
+from app.core.security import get_password_hash
+from app.db.session import SessionLocal, engine
+from app.models.task_model import Task
+from app.models.user_model import User
+
+PASSWORD = "Bench12@password"
+SEED_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+INSERT_BATCH = 5000
+
+
+def bench_email(index: int) -> str:
+    return f"bench-user-{index}@example.com"
+
+
+async def seed(users: int, tasks_per_user: int) -> list[User]:
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    password_hash = get_password_hash(PASSWORD)
+    seeded = []
+    async with SessionLocal() as session:
+        for index in range(users):
+            user = await crud.user.get_by_email(email=bench_email(index), db_session=session)
+            if not user:
+                user = User(name=f"bench{index}", email=bench_email(index), password_hash=password_hash)
+                session.add(user)
+                await session.commit()
+            count = await session.scalar(select(func.count()).select_from(Task).where(Task.user_id == user.id))
+            for start in range(count, tasks_per_user, INSERT_BATCH):
+                await session.execute(insert(Task), [
+                    {
+                        "user_id": user.id,
+                        "title": f"task {i % 1000:04d}",
+                        "description": f"benchmark task {i}",
+                        "create_at": SEED_START + timedelta(minutes=30 * i),
+                    } for i in range(start, min(start + INSERT_BATCH, tasks_per_user))
+                ])
+                await session.commit()
+            seeded.append(user)
+    return seeded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks-per-user", type=int, default=1000)
+    args = parser.parse_args()
+    seeded_users = asyncio.run(seed(args.users, args.tasks_per_user))
+    print(f"seeded {len(seeded_users)} users with {args.tasks_per_user} tasks each")
@@ -0,0 +1,30 @@
+"""Add task indexes
+
+Revision ID: 3b9e1f6c2a47
+Revises: ea48c6004e7b
+Create Date: 2026-10-18 11:00:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e1f6c2a47'
+down_revision: Union[str, None] = 'ea48c6004e7b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_task_user_id_id', 'task', ['user_id', 'id'], unique=False)
+    op.create_index('ix_task_user_id_title_id', 'task', ['user_id', 'title', 'id'], unique=False)
+    op.create_index('ix_task_user_id_create_at_id', 'task', ['user_id', 'create_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_user_id_create_at_id', table_name='task')
+    op.drop_index('ix_task_user_id_title_id', table_name='task')
+    op.drop_index('ix_task_user_id_id', table_name='task')
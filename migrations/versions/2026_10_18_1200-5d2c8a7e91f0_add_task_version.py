@@ -0,0 +1,52 @@
+"""Add task version
+
+Revision ID: 5d2c8a7e91f0
+Revises: 3b9e1f6c2a47
+Create Date: 2026-10-18 12:00:41.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2c8a7e91f0'
+down_revision: Union[str, None] = '3b9e1f6c2a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGER_EVENTS = (("insert", "NEW"), ("update", "NEW"), ("delete", "OLD"))
+
+
+def upgrade() -> None:
+    op.create_table(
+        'task_version',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_task_version() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO task_version (user_id, version)
+            SELECT DISTINCT user_id, 1 FROM changed_tasks WHERE user_id IS NOT NULL
+            ON CONFLICT (user_id) DO UPDATE SET version = task_version.version + 1;
+            RETURN NULL;
+        END
+        $$
+    """)
+    for event, table in TRIGGER_EVENTS:
+        op.execute(
+            f"CREATE TRIGGER task_version_{event} AFTER {event.upper()} ON task "
+            f"REFERENCING {table} TABLE AS changed_tasks FOR EACH STATEMENT EXECUTE FUNCTION bump_task_version()"
+        )
+
+
+def downgrade() -> None:
+    for event, _ in TRIGGER_EVENTS:
+        op.execute(f"DROP TRIGGER IF EXISTS task_version_{event} ON task")
+    op.execute("DROP FUNCTION IF EXISTS bump_task_version()")
+    op.drop_table('task_version')
@@ -0,0 +1,39 @@
+"""Add task search vector
+
+Revision ID: 8f4b6d1e2a93
+Revises: 5d2c8a7e91f0
+Create Date: 2026-10-18 13:00:07.551846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4b6d1e2a93'
+down_revision: Union[str, None] = '5d2c8a7e91f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rewrites the task table once to fill the generated column
+    op.add_column('task', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_task_search_vector', 'task', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_search_vector', table_name='task', postgresql_using='gin')
+    op.drop_column('task', 'search_vector')
@@ -0,0 +1,79 @@
+"""Add task count
+
+Revision ID: c4a7e2f19b36
+Revises: 8f4b6d1e2a93
+Create Date: 2026-10-18 14:00:12.551904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e2f19b36'
+down_revision: Union[str, None] = '8f4b6d1e2a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('task_version', sa.Column('task_count', sa.BigInteger(), server_default='0', nullable=False))
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_task_version() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                INSERT INTO task_version (user_id, version, task_count)
+                SELECT user_id, 1, sum(delta) FROM (
+                    SELECT user_id, 1 AS delta FROM changed_tasks
+                    UNION ALL
+                    SELECT user_id, -1 FROM old_tasks
+                ) AS moved
+                WHERE user_id IS NOT NULL GROUP BY user_id
+                ON CONFLICT (user_id) DO UPDATE
+                SET version = task_version.version + 1, task_count = task_version.task_count + excluded.task_count;
+            ELSE
+                INSERT INTO task_version (user_id, version, task_count)
+                SELECT user_id, 1, CASE TG_OP WHEN 'DELETE' THEN -count(*) ELSE count(*) END FROM changed_tasks
+                WHERE user_id IS NOT NULL GROUP BY user_id
+                ON CONFLICT (user_id) DO UPDATE
+                SET version = task_version.version + 1, task_count = task_version.task_count + excluded.task_count;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("DROP TRIGGER IF EXISTS task_version_update ON task")
+    op.execute(
+        "CREATE TRIGGER task_version_update AFTER UPDATE ON task "
+        "REFERENCING OLD TABLE AS old_tasks NEW TABLE AS changed_tasks "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_task_version()"
+    )
+    # Writes wait for the backfill, so no task is counted twice or missed
+    op.execute("LOCK TABLE task IN SHARE MODE")
+    op.execute("""
+        INSERT INTO task_version (user_id, version, task_count)
+        SELECT user_id, 1, count(*) FROM task GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET version = task_version.version + 1, task_count = excluded.task_count
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_task_version() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO task_version (user_id, version)
+            SELECT DISTINCT user_id, 1 FROM changed_tasks WHERE user_id IS NOT NULL
+            ON CONFLICT (user_id) DO UPDATE SET version = task_version.version + 1;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("DROP TRIGGER IF EXISTS task_version_update ON task")
+    op.execute(
+        "CREATE TRIGGER task_version_update AFTER UPDATE ON task "
+        "REFERENCING NEW TABLE AS changed_tasks FOR EACH STATEMENT EXECUTE FUNCTION bump_task_version()"
+    )
+    op.drop_column('task_version', 'task_count')
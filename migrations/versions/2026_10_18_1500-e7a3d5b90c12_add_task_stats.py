@@ -0,0 +1,78 @@
+"""Add task stats
+
+Revision ID: e7a3d5b90c12
+Revises: c4a7e2f19b36
+Create Date: 2026-10-18 15:00:27.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3d5b90c12'
+down_revision: Union[str, None] = 'c4a7e2f19b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGER_TABLES = {
+    "insert": "NEW TABLE AS changed_tasks",
+    "update": "OLD TABLE AS old_tasks NEW TABLE AS changed_tasks",
+    "delete": "OLD TABLE AS changed_tasks",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'task_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('created', sa.BigInteger(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION roll_up_task_stats() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                INSERT INTO task_stats (user_id, day, created)
+                SELECT user_id, day, sum(delta) FROM (
+                    SELECT user_id, (create_at AT TIME ZONE 'UTC')::date AS day, 1 AS delta FROM changed_tasks
+                    UNION ALL
+                    SELECT user_id, (create_at AT TIME ZONE 'UTC')::date, -1 FROM old_tasks
+                ) AS moved
+                WHERE user_id IS NOT NULL GROUP BY user_id, day HAVING sum(delta) <> 0 ORDER BY user_id, day
+                ON CONFLICT (user_id, day) DO UPDATE SET created = task_stats.created + excluded.created;
+            ELSE
+                INSERT INTO task_stats (user_id, day, created)
+                SELECT user_id, (create_at AT TIME ZONE 'UTC')::date AS day,
+                       CASE TG_OP WHEN 'DELETE' THEN -count(*) ELSE count(*) END
+                FROM changed_tasks
+                WHERE user_id IS NOT NULL GROUP BY user_id, day ORDER BY user_id, day
+                ON CONFLICT (user_id, day) DO UPDATE SET created = task_stats.created + excluded.created;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    for event, tables in TRIGGER_TABLES.items():
+        op.execute(
+            f"CREATE TRIGGER task_stats_{event} AFTER {event.upper()} ON task "
+            f"REFERENCING {tables} FOR EACH STATEMENT EXECUTE FUNCTION roll_up_task_stats()"
+        )
+    # Writes wait for the backfill, so no task is counted twice or missed
+    op.execute("LOCK TABLE task IN SHARE MODE")
+    op.execute("""
+        INSERT INTO task_stats (user_id, day, created)
+        SELECT user_id, (create_at AT TIME ZONE 'UTC')::date, count(*) FROM task
+        WHERE user_id IS NOT NULL GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    for event in TRIGGER_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS task_stats_{event} ON task")
+    op.execute("DROP FUNCTION IF EXISTS roll_up_task_stats()")
+    op.drop_table('task_stats')
@@ -0,0 +1,51 @@
+"""Order task version upserts
+
+Revision ID: a1f4c8e2d7b5
+Revises: e7a3d5b90c12
+Create Date: 2026-10-18 16:00:09.274518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1f4c8e2d7b5'
+down_revision: Union[str, None] = 'e7a3d5b90c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BUMP_TASK_VERSION_FUNCTION = """
+    CREATE OR REPLACE FUNCTION bump_task_version() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' THEN
+            INSERT INTO task_version (user_id, version, task_count)
+            SELECT user_id, 1, sum(delta) FROM (
+                SELECT user_id, 1 AS delta FROM changed_tasks
+                UNION ALL
+                SELECT user_id, -1 FROM old_tasks
+            ) AS moved
+            WHERE user_id IS NOT NULL GROUP BY user_id{order}
+            ON CONFLICT (user_id) DO UPDATE
+            SET version = task_version.version + 1, task_count = task_version.task_count + excluded.task_count;
+        ELSE
+            INSERT INTO task_version (user_id, version, task_count)
+            SELECT user_id, 1, CASE TG_OP WHEN 'DELETE' THEN -count(*) ELSE count(*) END FROM changed_tasks
+            WHERE user_id IS NOT NULL GROUP BY user_id{order}
+            ON CONFLICT (user_id) DO UPDATE
+            SET version = task_version.version + 1, task_count = task_version.task_count + excluded.task_count;
+        END IF;
+        RETURN NULL;
+    END
+    $$
+"""
+
+
+def upgrade() -> None:
+    # Concurrent multi-user statements lock the counter rows in the same order instead of deadlocking
+    op.execute(BUMP_TASK_VERSION_FUNCTION.format(order=" ORDER BY user_id"))
+
+
+def downgrade() -> None:
+    op.execute(BUMP_TASK_VERSION_FUNCTION.format(order=""))
@@ -12,6 +12,9 @@ from app.models.user_model import User
 from app.utils.token import generate_token
 from sqlmodel.ext.asyncio.session import AsyncSession
 import logging
+from contextlib import contextmanager
+from app.core.sql_accounting import track_queries
+from app.core.limiter import limiter
 
 client = AsyncClient(app=app)
 
@@ -25,6 +28,7 @@ async def init_db():
         await conn.run_sync(SQLModel.metadata.drop_all)
         logging.info("Dropping all tables")
         await conn.run_sync(SQLModel.metadata.create_all)
+    limiter.reset()
 
 
 @pytest_asyncio.fixture(scope='function')
@@ -56,12 +60,28 @@ async def test_user(get_session) -> User:
         email="test@test.com",
         password="Test123@#",
     )
+    user = await crud.user.get_by_email(email=user_data.email, db_session=get_session)
+    if user:
+        return user
     user = await crud.user.create_user(obj_in=user_data, db_session=get_session)
     assert user is not None
     assert isinstance(user, User)
     return user
 
 
+# A second user, owner of the tasks test_user must not touch
+@pytest_asyncio.fixture(scope='function')
+async def other_user(get_session) -> User:
+    from app import crud
+    from app.schemas.user_schema import IUserCreate
+    user = await crud.user.get_by_email(email="other@test.com", db_session=get_session)
+    if user:
+        return user
+    return await crud.user.create_user(
+        obj_in=IUserCreate(name="other", email="other@test.com", password="Test123@#"), db_session=get_session
+    )
+
+
 @pytest_asyncio.fixture(scope='function')
 async def create_test_tasks(get_session, test_user) -> None:
     from app import crud
@@ -86,3 +106,18 @@ def authorized_client(test_client: AsyncClient, test_user: User) -> AsyncClient:
     test_client.cookies.set("refresh_token", token_data.refresh_token)
     test_client.headers["Authorization"] = f"Bearer {token_data.access_token}"
     return test_client
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Fails the test when the block runs more statements than allowed, e.g.
+    `with query_budget(3): await authorized_client.get("/task")`
+    """
+    @contextmanager
+    def budget(max_queries: int):
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= max_queries, f"Query budget of {max_queries} exceeded: {stats.report()}"
+
+    return budget
@@ -0,0 +1,23 @@
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+
+
+@pytest.mark.asyncio
+async def test_health_stats_are_off_by_default(test_client):
+    response = await test_client.get("/health/pool")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_pool_stats(monkeypatch):
+    from app.main import create_app
+
+    monkeypatch.setattr(settings, "HEALTH_STATS_ENABLED", True)
+    async with AsyncClient(app=create_app(), base_url="http://fastapi.localhost") as client:
+        response = await client.get("/health/pool")
+    assert response.status_code == 200
+    stats = response.json()
+    assert set(stats) == {"size", "checked_out", "idle", "overflow", "max_overflow"}
+    assert stats["checked_out"] >= 0
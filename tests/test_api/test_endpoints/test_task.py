@@ -1,5 +1,11 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
 import pytest
-from app.schemas.task_schema import ITaskCreate, ITaskUpdate
+from app.schemas.task_schema import ITaskCreate, ITaskImport, ITaskUpdate
+from app.models.user_model import User
 from app import crud
 
 
@@ -39,3 +45,252 @@ async def test_delete_task(authorized_client, init_db, get_session, create_test_
 
     deleted_task = await crud.task.get_by_id(1, db_session=get_session)
     assert deleted_task is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("order_by", ["id", "title", "create_at"])
+@pytest.mark.parametrize("order", ["ascendant", "descendent"])
+async def test_get_sorted_tasks_by_cursor(authorized_client, init_db, create_test_tasks, order_by, order):
+    expected = await authorized_client.get("/task", params={"size": 100})
+    expected_tasks = sorted(expected.json()["items"], key=lambda task: (task[order_by], task["id"]),
+                            reverse=order == "descendent")
+    expected_ids = [task["id"] for task in expected_tasks]
+
+    seen_ids = []
+    params = {"order_by": order_by, "order": order, "size": 4, "include_total": True}
+    response = await authorized_client.get("/task/sorted/cursor", params=params)
+    assert response.status_code == 200
+    assert response.json()["total"] == len(expected_ids)
+    while True:
+        page = response.json()
+        seen_ids.extend(task["id"] for task in page["items"])
+        if not page["next_cursor"]:
+            break
+        response = await authorized_client.get("/task/sorted/cursor", params={**params, "cursor": page["next_cursor"]})
+    assert seen_ids == expected_ids
+
+    response = await authorized_client.get("/task/sorted/cursor", params={**params, "cursor": page["previous_cursor"]})
+    assert [task["id"] for task in response.json()["items"]] == expected_ids[-len(page["items"]) - 4:-len(page["items"])]
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_by_invalid_cursor(authorized_client, init_db):
+    response = await authorized_client.get("/task/cursor", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_tasks(authorized_client, init_db, get_session, other_user):
+    foreign_task = await crud.task.create_task(ITaskCreate(title="foreign", description=None), other_user,
+                                               db_session=get_session)
+
+    new_tasks = [ITaskCreate(title=f"bulk{i}", description=f"bulk description {i}").dict() for i in range(3)]
+    response = await authorized_client.post("/task/bulk", json=new_tasks)
+    assert response.status_code == 200
+    created = response.json()
+    assert [item["status_code"] for item in created] == [201, 201, 201]
+    assert [item["task"]["title"] for item in created] == ["bulk0", "bulk1", "bulk2"]
+    ids = [item["id"] for item in created]
+
+    updates = [
+        {"id": ids[0], "title": "bulk updated", "description": None},
+        {"id": foreign_task.id, "title": "stolen", "description": None},
+        {"id": 10 ** 9, "title": "missing", "description": None},
+        {"id": ids[0], "title": "twice", "description": None},
+    ]
+    response = await authorized_client.put("/task/bulk", json=updates)
+    assert response.status_code == 200
+    assert [item["status_code"] for item in response.json()] == [200, 403, 404, 409]
+    assert (await crud.task.get_task_by_id(ids[0], db_session=get_session)).title == "bulk updated"
+    assert (await crud.task.get_task_by_id(foreign_task.id, db_session=get_session)).title == "foreign"
+
+    response = await authorized_client.request("DELETE", "/task/bulk", json=[ids[1], ids[2], foreign_task.id])
+    assert response.status_code == 200
+    assert [item["status_code"] for item in response.json()] == [204, 204, 403]
+    assert await crud.task.get_task_by_id(ids[1], db_session=get_session) is None
+    assert await crud.task.get_task_by_id(foreign_task.id, db_session=get_session) is not None
+
+
+@pytest.mark.asyncio
+async def test_export_tasks(authorized_client, init_db, create_test_tasks, test_user, get_session):
+    tasks = await crud.task.get_users_tasks_by_id(test_user.id, db_session=get_session)
+
+    response = await authorized_client.get("/task/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == sorted(task.id for task in tasks)
+
+    response = await authorized_client.get("/task/export", params={"format": "csv"})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == len(tasks)
+    assert set(rows[0]) == {"id", "user_id", "title", "description", "create_at"}
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_foreign_or_missing_task(authorized_client, init_db, get_session, other_user):
+    foreign_task = await crud.task.create_task(ITaskCreate(title="foreign", description=None), other_user,
+                                               db_session=get_session)
+    renew_task_data = ITaskUpdate(title="stolen", description=None).dict()
+
+    response = await authorized_client.put(f"/task?id={foreign_task.id}", json=renew_task_data)
+    assert response.status_code == 403
+    response = await authorized_client.put(f"/task?id={10 ** 9}", json=renew_task_data)
+    assert response.status_code == 404
+    response = await authorized_client.delete(f"/task?id={foreign_task.id}")
+    assert response.status_code == 403
+    response = await authorized_client.delete(f"/task?id={10 ** 9}")
+    assert response.status_code == 404
+    assert (await crud.task.get_task_by_id(foreign_task.id, db_session=get_session)).title == "foreign"
+
+
+@pytest.mark.asyncio
+async def test_task_endpoints_query_budget(authorized_client, init_db, create_test_tasks, query_budget):
+    with query_budget(3):
+        response = await authorized_client.get("/task")
+    assert int(response.headers["X-DB-Queries"]) <= 3
+    assert float(response.headers["X-DB-Time"]) > 0
+
+    with query_budget(3):
+        response = await authorized_client.get("/task/sorted/cursor", params={"order_by": "title"})
+    task_id = response.json()["items"][0]["id"]
+
+    with query_budget(3):
+        await authorized_client.put(f"/task?id={task_id}", json=ITaskUpdate(title="budget", description=None).dict())
+    with query_budget(3):
+        await authorized_client.post("/task/bulk", json=[ITaskCreate(title="b", description=None).dict()] * 20)
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_conditional(authorized_client, init_db, create_test_tasks, query_budget):
+    response = await authorized_client.get("/task/sorted", params={"order_by": "title"})
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+
+    with query_budget(2) as stats:
+        response = await authorized_client.get(
+            "/task/sorted", params={"order_by": "title"}, headers={"If-None-Match": etag}
+        )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    assert not any("task.user_id" in statement for statement in stats.statements)
+
+    other = await authorized_client.get("/task/sorted", params={"order_by": "title", "order": "descendent"})
+    assert other.headers["ETag"] != etag
+
+    await authorized_client.post("/task", json=ITaskCreate(title="etag", description=None).dict())
+    response = await authorized_client.get(
+        "/task/sorted", params={"order_by": "title"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_task_pages_cached_until_write(authorized_client, init_db, create_test_tasks, query_budget):
+    from app.crud.task_crud import task_page_cache
+    params = {"order_by": "create_at", "order": "descendent", "size": 7}
+    first = await authorized_client.get("/task/sorted", params=params)
+    hits = task_page_cache.hits
+
+    with query_budget(2) as stats:
+        cached = await authorized_client.get("/task/sorted", params=params)
+    assert cached.content == first.content
+    assert task_page_cache.hits == hits + 1
+    assert not any("task.user_id" in statement for statement in stats.statements)
+
+    created = await authorized_client.post("/task", json=ITaskCreate(title="cached", description=None).dict())
+    response = await authorized_client.get("/task/sorted", params=params)
+    assert response.json()["items"][0]["id"] == created.json()["id"]
+    assert response.json()["total"] == first.json()["total"] + 1
+
+    stats = task_page_cache.stats()
+    assert stats["hits"] >= 1 and stats["bytes"] > 0
+
+
+@pytest.mark.asyncio
+async def test_search_tasks(authorized_client, init_db, get_session, test_user):
+    await authorized_client.post("/task/bulk", json=[
+        ITaskCreate(title="Buy groceries", description="milk and bread").dict(),
+        ITaskCreate(title="Bake bread", description="sourdough").dict(),
+        ITaskCreate(title="Write report", description=None).dict(),
+    ])
+    other = User(name="other", email="search-other@example.com", password_hash="-")
+    get_session.add(other)
+    await get_session.commit()
+    await crud.task.create_task(ITaskCreate(title="bread", description=None), other, db_session=get_session)
+
+    response = await authorized_client.get("/task/search", params={"q": "bread"})
+    assert response.status_code == 200
+    titles = [task["title"] for task in response.json()["items"]]
+    assert titles == ["Bake bread", "Buy groceries"]
+    assert all(task["user_id"] == test_user.id for task in response.json()["items"])
+    assert "search_vector" not in response.json()["items"][0]
+
+    response = await authorized_client.get("/task/search", params={"q": "bread -milk"})
+    assert [task["title"] for task in response.json()["items"]] == ["Bake bread"]
+
+    response = await authorized_client.get("/task/search", params={"q": ""})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_import_tasks(authorized_client, init_db, get_session, test_user, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "TASK_IMPORT_CHUNK_SIZE", 2)
+    before = len(await crud.task.get_users_tasks_by_id(test_user.id, db_session=get_session))
+    lines = [json.dumps({"title": f"imported {i}", "description": None}) for i in range(5)]
+    lines.insert(2, json.dumps({"description": "missing title"}))
+    response = await authorized_client.post(
+        "/task/import", params={"format": "ndjson"}, content="\n".join(lines).encode()
+    )
+    assert response.status_code == 201
+    result = response.json()
+    assert result["imported"] == 5
+    assert result["failed"] == 1
+    assert result["errors"][0]["line"] == 3
+
+    exported = await authorized_client.get("/task/export", params={"format": "csv"})
+    response = await authorized_client.post("/task/import", params={"format": "csv"}, content=exported.content)
+    assert response.json() == {"imported": before + 5, "failed": 0, "errors": []}
+    tasks = await crud.task.get_users_tasks_by_id(test_user.id, db_session=get_session)
+    assert len(tasks) == 2 * (before + 5)
+
+
+@pytest.mark.asyncio
+async def test_get_task_stats(authorized_client, init_db, test_user, get_session):
+    async def imported():
+        for day in (1, 2, 7, 8, 8, 20):
+            yield ITaskImport(title=f"week {day}", create_at=datetime(2002, 1, day, tzinfo=timezone.utc))
+
+    await crud.task.import_tasks(imported(), test_user, chunk_size=10, db_session=get_session)
+    params = {"bucket": "week", "from": "2002-01-02", "to": "2002-01-31"}
+    response = await authorized_client.get("/task/stats", params=params)
+    assert response.status_code == 200
+    # Weeks start on Monday, the first one is cut at `from`
+    assert response.json() == {
+        "bucket": "week",
+        "from_date": "2002-01-02",
+        "to_date": "2002-01-31",
+        "total": 5,
+        "buckets": [
+            {"start": "2001-12-31", "created": 1},
+            {"start": "2002-01-07", "created": 3},
+            {"start": "2002-01-14", "created": 1},
+        ],
+    }
+
+    await crud.task.create_tasks_bulk(
+        [ITaskCreate(title="week today", description=None)], test_user, db_session=get_session
+    )
+    response = await authorized_client.get("/task/stats", params={"bucket": "month"})
+    assert response.json()["buckets"][-1]["start"] == datetime.now(timezone.utc).date().replace(day=1).isoformat()
+
+    response = await authorized_client.get("/task/stats", params={"from": "2002-02-01", "to": "2002-01-01"})
+    assert response.status_code == 400
+
+    response = await authorized_client.get("/task/stats", params={"to": "0001-06-01"})
+    assert response.status_code == 200
+    assert response.json()["from_date"] == "0001-01-01"
@@ -0,0 +1,62 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.api.endpoints import metrics
+from app.core.metrics import MetricsMiddleware, instrument_engine, REGISTRY
+from app.core.config import settings
+from app.db.session import engine, get_engine_args
+
+
+@pytest.mark.asyncio
+async def test_metrics_record_requests_and_queries():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    instrument_engine(engine)
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        for item_id in range(3):
+            assert (await client.get(f"/items/{item_id}")).status_code == 200
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="200"}' in response.text
+    assert REGISTRY.get_sample_value("db_query_duration_seconds_count", {"operation": "select"}) >= 1
+    assert REGISTRY.get_sample_value("db_pool_checked_out_connections") == 0
+
+
+@pytest.mark.asyncio
+async def test_replica_queries_are_recorded(monkeypatch):
+    from app.main import create_app
+
+    replica = create_async_engine(engine.url, **get_engine_args())
+    monkeypatch.setattr("app.db.session.replica_engines", [replica])
+    monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+    create_app()
+    before = REGISTRY.get_sample_value("db_query_duration_seconds_count", {"operation": "select"}) or 0
+    try:
+        async with replica.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        await replica.dispose()
+    assert REGISTRY.get_sample_value("db_query_duration_seconds_count", {"operation": "select"}) == before + 1
+
+
+def test_pool_capacity_adds_up_over_engines():
+    replica = create_async_engine(engine.url, poolclass=AsyncAdaptedQueuePool, pool_size=3)
+    before = REGISTRY.get_sample_value("db_pool_capacity_connections")
+    instrument_engine(replica)
+    instrument_engine(replica)
+    after = REGISTRY.get_sample_value("db_pool_capacity_connections")
+    assert after == before + 3 + settings.DB_MAX_OVERFLOW
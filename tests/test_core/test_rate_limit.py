@@ -0,0 +1,104 @@
+import sqlite3
+import time
+
+import pytest
+from limits import parse
+from limits.storage import MemoryStorage, storage_from_string
+from limits.strategies import MovingWindowRateLimiter
+from starlette.requests import Request
+
+from app.core.rate_limit import SLIDING_WINDOW_COUNTER, SQLiteStorage, SlidingWindowCounterRateLimiter
+from app.core.rate_limit import get_user_or_remote_address, register_strategy
+from app.core.security import create_access_token
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStorage()
+    return storage_from_string(f"sqlite:///{tmp_path}/limits.sqlite")
+
+
+def test_sqlite_storage_from_uri(tmp_path):
+    storage = storage_from_string(f"sqlite:///{tmp_path}/limits.sqlite")
+    assert isinstance(storage, SQLiteStorage)
+    assert storage.path == f"{tmp_path}/limits.sqlite"
+    assert storage.incr("key", 10) == 1
+    assert storage.incr("key", 10, amount=2) == 3
+    assert storage.get("key") == 3
+    storage.clear("key")
+    assert storage.get("key") == 0
+
+
+def test_sqlite_storage_shared_between_instances(tmp_path):
+    uri = f"sqlite:///{tmp_path}/limits.sqlite"
+    first, second = storage_from_string(uri), storage_from_string(uri)
+    first.incr("key", 10)
+    second.incr("key", 10)
+    assert first.get("key") == 2
+
+
+def test_sqlite_storage_gives_up_quickly_on_a_held_write_lock(tmp_path):
+    storage = storage_from_string(f"sqlite:///{tmp_path}/limits.sqlite")
+    other_worker = sqlite3.connect(f"{tmp_path}/limits.sqlite", isolation_level=None)
+    other_worker.execute("BEGIN IMMEDIATE")
+    start = time.perf_counter()
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            storage.incr("key", 10)
+    finally:
+        other_worker.execute("ROLLBACK")
+    assert time.perf_counter() - start < 1
+    assert storage.incr("key", 10) == 1
+
+
+def test_strategy_name_collisions_fail_loudly():
+    register_strategy(SLIDING_WINDOW_COUNTER, SlidingWindowCounterRateLimiter)
+    with pytest.raises(RuntimeError):
+        register_strategy(SLIDING_WINDOW_COUNTER, MovingWindowRateLimiter)
+    with pytest.raises(RuntimeError):
+        register_strategy("fixed-window", SlidingWindowCounterRateLimiter)
+
+
+def test_sliding_window_rejects_over_limit(storage):
+    limiter = SlidingWindowCounterRateLimiter(storage)
+    item = parse("5/minute")
+    assert all(limiter.hit(item, "user:1") for _ in range(5))
+    assert not limiter.hit(item, "user:1")
+    assert not limiter.test(item, "user:1")
+    assert limiter.hit(item, "user:2")
+    assert limiter.get_window_stats(item, "user:1").remaining == 0
+
+
+def test_sliding_window_weights_previous_window(storage, monkeypatch):
+    limiter = SlidingWindowCounterRateLimiter(storage)
+    item = parse("10/minute")
+    start = (time.time() // 60 + 1) * 60
+    monkeypatch.setattr(time, "time", lambda: start + 1)
+    for _ in range(10):
+        assert limiter.hit(item, "user:1")
+    # A quarter into the next window 75% of the previous hits still count
+    monkeypatch.setattr(time, "time", lambda: start + 75)
+    assert limiter.get_window_stats(item, "user:1").remaining == 2
+    assert limiter.hit(item, "user:1")
+    assert limiter.hit(item, "user:1")
+    assert not limiter.hit(item, "user:1")
+
+
+def make_request(headers: dict[str, str]) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("10.0.0.1", 1234),
+    })
+
+
+def test_key_uses_token_subject():
+    token = create_access_token(7)
+    assert get_user_or_remote_address(make_request({"Authorization": f"Bearer {token}"})) == "user:7"
+    assert get_user_or_remote_address(make_request({"Cookie": f"access_token={token}"})) == "user:7"
+
+
+def test_key_falls_back_to_address():
+    assert get_user_or_remote_address(make_request({})) == "10.0.0.1"
+    assert get_user_or_remote_address(make_request({"Authorization": "Bearer invalid"})) == "10.0.0.1"
@@ -0,0 +1,40 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient
+
+from app.core.config import ModeEnum, settings
+from app.core.security_headers import PRODUCTION_CSP, SecurityHeadersMiddleware, build_security_headers
+
+
+def test_production_policy():
+    headers = dict(build_security_headers(settings.model_copy(update={"MODE": ModeEnum.production})))
+    assert headers[b"content-security-policy"] == PRODUCTION_CSP.encode()
+    assert headers[b"x-frame-options"] == b"DENY"
+
+
+@pytest.mark.asyncio
+async def test_headers_on_app_responses(test_client):
+    response = await test_client.get("/")
+    assert response.headers["x-frame-options"] == "DENY"
+    assert response.headers["x-xss-protection"] == "1; mode=block"
+    assert "frame-ancestors 'none'" in response.headers["content-security-policy"]
+    assert "access-control-allow-origin" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_passes_through():
+    app = FastAPI()
+    app.add_middleware(SecurityHeadersMiddleware, headers=[(b"x-test", b"1")])
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"{i}\n"
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/stream")
+    assert response.text == "0\n1\n2\n"
+    assert response.headers["x-test"] == "1"
@@ -0,0 +1,71 @@
+import argparse
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.db.session import engine, warm_up_pool
+from app.main import app
+from app import server
+
+
+def test_pool_budget_is_split_between_workers():
+    config = settings.model_copy(update={"DB_POOL_SIZE": 100, "WEB_CONCURRENCY": 4, "DB_MAX_OVERFLOW": 5})
+    assert config.WORKERS == 4
+    assert config.POOL_SIZE == 20
+    assert config.WORKERS * (config.POOL_SIZE + config.DB_MAX_OVERFLOW) <= config.DB_POOL_SIZE
+
+
+def test_workers_default_to_what_the_budget_holds(monkeypatch):
+    monkeypatch.setattr("os.sched_getaffinity", lambda pid: set(range(64)))
+    config = settings.model_copy(
+        update={"DB_POOL_SIZE": 90, "WEB_CONCURRENCY": 0, "DB_MIN_POOL_SIZE": 5, "DB_MAX_OVERFLOW": 10}
+    )
+    assert config.WORKERS == 6
+    assert config.POOL_SIZE == 5
+
+
+def test_web_concurrency_is_capped_at_the_budget():
+    config = settings.model_copy(
+        update={"DB_POOL_SIZE": 90, "WEB_CONCURRENCY": 32, "DB_MIN_POOL_SIZE": 5, "DB_MAX_OVERFLOW": 10}
+    )
+    assert config.WORKERS == 6
+    assert config.WORKERS * (config.POOL_SIZE + config.DB_MAX_OVERFLOW) <= config.DB_POOL_SIZE
+
+
+def test_server_refuses_a_budget_too_small_for_one_worker(monkeypatch):
+    config = settings.model_copy(
+        update={"DB_POOL_SIZE": 10, "WEB_CONCURRENCY": 4, "DB_MIN_POOL_SIZE": 5, "DB_MAX_OVERFLOW": 10}
+    )
+    monkeypatch.setattr(server, "settings", config)
+    monkeypatch.setattr(server.uvicorn, "run", lambda *args, **kwargs: pytest.fail("server started"))
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    with pytest.raises(SystemExit):
+        server.main(argparse.Namespace(host="127.0.0.1", port=8000))
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_leaves_connections_idle():
+    pooled = create_async_engine(engine.url, poolclass=AsyncAdaptedQueuePool, pool_size=3, max_overflow=0)
+    try:
+        assert await warm_up_pool(pooled, 10) == 3
+        assert pooled.sync_engine.pool.checkedin() == 3
+        assert pooled.sync_engine.pool.checkedout() == 0
+    finally:
+        await pooled.dispose()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_survives_an_unreachable_database():
+    pooled = create_async_engine(engine.url.set(host="127.0.0.1", port=1), poolclass=AsyncAdaptedQueuePool)
+    try:
+        assert await warm_up_pool(pooled, 2) == 0
+    finally:
+        await pooled.dispose()
+
+
+@pytest.mark.asyncio
+async def test_lifespan_runs_startup_and_shutdown():
+    async with app.router.lifespan_context(app):
+        pass
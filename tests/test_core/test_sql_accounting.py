@@ -0,0 +1,47 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.sql_accounting import QueryAccountingMiddleware, track_queries
+from app.db.session import engine, get_engine_args
+
+
+@pytest.mark.asyncio
+async def test_repeated_statements_are_reported(caplog):
+    app = FastAPI()
+    app.add_middleware(QueryAccountingMiddleware, n_plus_one_threshold=3)
+
+    @app.get("/n-plus-one")
+    async def n_plus_one():
+        async with engine.connect() as conn:
+            for i in range(4):
+                await conn.execute(text("SELECT CAST(:i AS INTEGER)"), {"i": i})
+        return {}
+
+    with track_queries() as outer, caplog.at_level(logging.WARNING):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/n-plus-one")
+
+    assert response.headers["X-DB-Queries"] == "4"
+    assert outer.count == 4
+    assert "Suspected N+1 queries in GET /n-plus-one" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_replica_statements_are_counted(monkeypatch):
+    from app.main import create_app
+
+    replica = create_async_engine(engine.url, **get_engine_args())
+    monkeypatch.setattr("app.db.session.replica_engines", [replica])
+    create_app()
+    try:
+        with track_queries() as stats:
+            async with replica.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        assert stats.count == 1
+    finally:
+        await replica.dispose()
@@ -0,0 +1,49 @@
+import time
+from datetime import timedelta
+
+import jwt
+import pytest
+
+from app.core import security
+from app.core.security import create_access_token, decode_token, token_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+def test_repeated_token_verified_once(monkeypatch):
+    token = create_access_token(5)
+    calls = []
+    verify_token = security.verify_token
+    monkeypatch.setattr(security, "verify_token", lambda t: calls.append(t) or verify_token(t))
+
+    assert decode_token(token)["sub"] == "5"
+    decode_token(token)["sub"] = "changed"
+    assert decode_token(token)["sub"] == "5"
+    assert len(calls) == 1
+    assert token_cache.stats()["hits"] == 2
+
+
+def test_cached_token_expires_with_token(monkeypatch):
+    token = create_access_token(5, expires_delta=timedelta(seconds=30))
+    calls = []
+    verify_token = security.verify_token
+    monkeypatch.setattr(security, "verify_token", lambda t: calls.append(t) or verify_token(t))
+    decode_token(token)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 29)
+    decode_token(token)
+    assert len(calls) == 1
+    monkeypatch.setattr(time, "monotonic", lambda: now + 31)
+    decode_token(token)
+    assert len(calls) == 2
+
+
+def test_invalid_token_not_cached():
+    with pytest.raises(jwt.DecodeError):
+        decode_token("not-a-token")
+    assert len(token_cache) == 0
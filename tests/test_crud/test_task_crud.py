@@ -0,0 +1,159 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from fastapi_pagination import Params
+from fastapi_pagination.ext.sqlmodel import paginate
+from sqlalchemy import delete, func, update
+from sqlmodel import select
+
+from app import crud
+from app.models.task_model import Task
+from app.models.task_stats_model import TaskStats
+from app.models.task_version_model import TaskVersion
+from app.schemas.common_schema import IOrderEnum
+from app.schemas.task_schema import IOrderByTaskEnum, ITaskBulkUpdate, ITaskCreate, ITaskImport, ITaskStatsBucketEnum
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("order_by", list(IOrderByTaskEnum))
+@pytest.mark.parametrize("order", list(IOrderEnum))
+async def test_precompiled_sorted_pages_match_paginate(get_session, test_user, create_test_tasks, order_by, order):
+    column = Task.__table__.columns[order_by]
+    query = select(Task).where(Task.user_id == test_user.id)
+    query = query.order_by(column.asc() if order == IOrderEnum.ascendant else column.desc(), Task.id)
+    for page in (1, 2):
+        params = Params(page=page, size=4)
+        expected = await paginate(get_session, query, params)
+        result = await crud.task.get_multy_tasks_sorted(
+            params=params, order_by=order_by, order=order, current_user=test_user, db_session=get_session
+        )
+        assert result.total == expected.total
+        assert result.page == expected.page and result.pages == expected.pages
+        assert [getattr(task, order_by.value) for task in result.items] == \
+               [getattr(task, order_by.value) for task in expected.items]
+
+
+async def actual_count(session, user_id: int) -> int:
+    return await session.scalar(select(func.count()).select_from(Task).where(Task.user_id == user_id))
+
+
+async def stored_count(session, user_id: int) -> int:
+    session.info.pop("task_versions", None)
+    return await crud.task.get_tasks_count(user_id, db_session=session)
+
+
+@pytest.mark.asyncio
+async def test_task_count_follows_every_write_path(get_session, test_user):
+    async def imported():
+        for i in range(3):
+            yield ITaskImport(title=f"imported {i}")
+
+    task = await crud.task.create_task(ITaskCreate(title="counted", description="one"), test_user, get_session)
+    assert await stored_count(get_session, test_user.id) == await actual_count(get_session, test_user.id)
+    results = await crud.task.create_tasks_bulk(
+        [ITaskCreate(title=f"bulk {i}", description="many") for i in range(4)], test_user, get_session
+    )
+    await crud.task.import_tasks(imported(), test_user, chunk_size=2, db_session=get_session)
+    await crud.task.update_tasks_bulk(
+        [ITaskBulkUpdate(id=task.id, title="renamed", description="one")], test_user, db_session=get_session
+    )
+    assert await stored_count(get_session, test_user.id) == await actual_count(get_session, test_user.id)
+    await crud.task.remove_task(task.id, test_user, get_session)
+    await crud.task.remove_tasks_bulk([result.id for result in results], test_user, get_session)
+    assert await stored_count(get_session, test_user.id) == await actual_count(get_session, test_user.id)
+
+    page = await crud.task.get_multy_tasks_paginated(params=Params(), current_user=test_user, db_session=get_session)
+    assert page.total == await actual_count(get_session, test_user.id)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_fixes_drifted_task_counts(get_session, test_user, create_test_tasks):
+    await get_session.execute(
+        update(TaskVersion).where(TaskVersion.user_id == test_user.id).values(task_count=TaskVersion.task_count + 7)
+    )
+    await get_session.commit()
+    version = await crud.task.get_tasks_version(test_user.id, db_session=get_session)
+
+    assert await crud.task.reconcile_task_counts(batch_size=1, db_session=get_session) == 1
+    assert await stored_count(get_session, test_user.id) == await actual_count(get_session, test_user.id)
+    assert await crud.task.get_tasks_version(test_user.id, db_session=get_session) > version
+    assert await crud.task.reconcile_task_counts(db_session=get_session) == 0
+
+
+STATS_FROM, STATS_TO = date(2001, 1, 1), date(2001, 12, 31)
+
+
+async def stats_by_scan(session, user_id: int, bucket: ITaskStatsBucketEnum) -> list[tuple[date, int]]:
+    create_at = func.timezone("UTC", Task.create_at)
+    start = func.date_trunc(bucket.value, create_at)
+    rows = await session.execute(
+        select(start, func.count())
+        .where(Task.user_id == user_id, create_at >= STATS_FROM, create_at < datetime(2002, 1, 1))
+        .group_by(start).order_by(start)
+    )
+    return [(row[0].date(), row[1]) for row in rows]
+
+
+async def stats_from_rollup(session, user, bucket: ITaskStatsBucketEnum) -> list[tuple[date, int]]:
+    stats = await crud.task.get_task_stats(
+        current_user=user, bucket=bucket, from_date=STATS_FROM, to_date=STATS_TO, db_session=session
+    )
+    assert stats.total == sum(item.created for item in stats.buckets)
+    return [(item.start, item.created) for item in stats.buckets]
+
+
+@pytest.mark.asyncio
+async def test_task_stats_follow_every_write_path(get_session, test_user):
+    async def imported():
+        for day in (1, 1, 2, 9, 30):
+            yield ITaskImport(title=f"stats {day}", create_at=datetime(2001, 1, day, 23, 30, tzinfo=timezone.utc))
+        yield ITaskImport(title="stats march", create_at=datetime(2001, 3, 15, tzinfo=timezone.utc))
+
+    await crud.task.import_tasks(imported(), test_user, chunk_size=4, db_session=get_session)
+    tasks = (await get_session.scalars(
+        select(Task).where(Task.user_id == test_user.id, Task.title.startswith("stats")).order_by(Task.id)
+    )).all()
+    await get_session.execute(
+        update(Task).where(Task.id == tasks[0].id).values(create_at=datetime(2001, 2, 3, tzinfo=timezone.utc))
+    )
+    await get_session.commit()
+    await crud.task.update_tasks_bulk(
+        [ITaskBulkUpdate(id=tasks[1].id, title="stats renamed", description=None)], test_user, db_session=get_session
+    )
+    await crud.task.remove_task(tasks[-1].id, test_user, get_session)
+
+    for bucket in ITaskStatsBucketEnum:
+        assert await stats_from_rollup(get_session, test_user, bucket) == \
+               await stats_by_scan(get_session, test_user.id, bucket)
+    assert await stats_from_rollup(get_session, test_user, ITaskStatsBucketEnum.month) == \
+           [(date(2001, 1, 1), 4), (date(2001, 2, 1), 1)]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_fixes_drifted_task_stats(get_session, test_user, create_test_tasks):
+    await get_session.execute(delete(TaskStats).where(TaskStats.user_id == test_user.id))
+    await get_session.commit()
+    version = await crud.task.get_tasks_version(test_user.id, db_session=get_session)
+
+    assert await crud.task.rebuild_task_stats(batch_size=1, db_session=get_session) == 1
+    stored = await get_session.scalar(select(func.sum(TaskStats.created)).where(TaskStats.user_id == test_user.id))
+    assert stored == await actual_count(get_session, test_user.id)
+    assert await crud.task.get_tasks_version(test_user.id, db_session=get_session) > version
+    assert await crud.task.rebuild_task_stats(db_session=get_session) == 0
+
+
+@pytest.mark.asyncio
+async def test_update_and_remove_task_loaded_in_the_session(get_session, test_user):
+    task = await crud.task.create_task(ITaskCreate(title="orig", description=None), test_user, get_session)
+    loaded = await crud.task.get_task_by_id(task.id, db_session=get_session)
+
+    updated = await crud.task.update_task(
+        task.id, ITaskCreate(title="new", description="d"), test_user, db_session=get_session
+    )
+    assert (updated.title, updated.description) == ("new", "d")
+    assert (await crud.task.get_task_by_id(task.id, db_session=get_session)).title == "new"
+
+    removed = await crud.task.remove_task(task.id, test_user, get_session)
+    assert removed.id == task.id and removed.title == "new"
+    assert loaded not in get_session
+    assert await crud.task.get_task_by_id(task.id, db_session=get_session) is None
@@ -0,0 +1,138 @@
+"""
+Runs EXPLAIN on every statement CRUDTasks emits and fails when Postgres has to fall back to a
+sequential scan or an explicit sort. Seq scans and sorts are disabled for the EXPLAIN session,
+so the planner only picks them when no index can serve the query.
+"""
+import json
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from fastapi_pagination import Params
+from sqlalchemy import event, insert, text
+
+from app import crud
+from app.db.session import engine
+from app.models.task_model import Task
+from app.models.user_model import User
+from app.schemas.common_schema import IOrderEnum, ICursorParams
+from app.schemas.task_schema import IOrderByTaskEnum, ITaskCreate, ITaskUpdate
+
+SEED_TASKS = 5000
+FORBIDDEN_NODES = {"Seq Scan", "Sort", "Incremental Sort"}
+# Ranked search has to sort its matches by rank
+ALLOWED_NODES = {"search": {"Sort"}}
+
+
+@contextmanager
+def capture_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def find_nodes(plan: dict) -> set[str]:
+    nodes = {plan["Node Type"]}
+    for child in plan.get("Plans", []):
+        nodes |= find_nodes(child)
+    return nodes
+
+
+async def explain(statements) -> list[tuple[str, set[str]]]:
+    plans = []
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("SET enable_seqscan = off")
+        await conn.exec_driver_sql("SET enable_sort = off")
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            plans.append((statement, find_nodes(plan[0]["Plan"])))
+        await conn.rollback()
+    return plans
+
+
+@pytest_asyncio.fixture(scope='function')
+async def seeded_user(get_session) -> User:
+    user = await crud.user.get_by_email(email="plans@test.com", db_session=get_session)
+    if user:
+        return user
+    user = User(name="plans", email="plans@test.com", password_hash="-")
+    get_session.add(user)
+    await get_session.commit()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    await get_session.execute(insert(Task), [
+        {
+            "user_id": user.id,
+            "title": f"task {i % 97}",
+            "description": f"seeded task {i}",
+            "create_at": start + timedelta(hours=i),
+        } for i in range(SEED_TASKS)
+    ])
+    await get_session.commit()
+    await get_session.execute(text("ANALYZE task"))
+    return user
+
+
+async def read_cursor_pages(call, **kwargs):
+    page = await call(cursor_params=ICursorParams(size=20, include_total=True), **kwargs)
+    page = await call(cursor_params=ICursorParams(size=20, cursor=page.next_cursor), **kwargs)
+    await call(cursor_params=ICursorParams(size=20, cursor=page.previous_cursor), **kwargs)
+
+
+async def write_task(user, session):
+    task = await crud.task.create_task(ITaskCreate(title="plan", description=None), user, db_session=session)
+    await crud.task.update_task(task.id, ITaskUpdate(title="plan", description=None), current_user=user,
+                                db_session=session)
+    await crud.task.remove_task(task.id, current_user=user, db_session=session)
+
+
+CASES = {
+    "paginated": lambda user, session: crud.task.get_multy_tasks_paginated(
+        params=Params(page=10, size=50), current_user=user, db_session=session),
+    "paginated_cursor": lambda user, session: read_cursor_pages(
+        crud.task.get_multy_tasks_paginated, current_user=user, db_session=session),
+    "filtered": lambda user, session: crud.task.get_multy_tasks_filtered_by_date(
+        params=Params(page=2, size=50), from_date=date(2024, 2, 1), to_date=date(2024, 3, 1),
+        current_user=user, db_session=session),
+    "filtered_cursor": lambda user, session: read_cursor_pages(
+        crud.task.get_multy_tasks_filtered_by_date, from_date=date(2024, 2, 1), to_date=date(2024, 3, 1),
+        current_user=user, db_session=session),
+    "task_by_id": lambda user, session: crud.task.get_task_by_id(SEED_TASKS // 2, db_session=session),
+    "users_tasks": lambda user, session: crud.task.get_users_tasks_by_id(user.id, db_session=session),
+    "write_task": lambda user, session: write_task(user, session),
+    "search": lambda user, session: crud.task.search_tasks(
+        q="task 42", params=Params(page=1, size=20), current_user=user, db_session=session),
+}
+for _order_by in IOrderByTaskEnum:
+    for _order in IOrderEnum:
+        CASES[f"sorted_{_order_by.value}_{_order.value}"] = (
+            lambda user, session, order_by=_order_by, order=_order: crud.task.get_multy_tasks_sorted(
+                params=Params(page=3, size=50), order_by=order_by, order=order,
+                current_user=user, db_session=session)
+        )
+        CASES[f"sorted_cursor_{_order_by.value}_{_order.value}"] = (
+            lambda user, session, order_by=_order_by, order=_order: read_cursor_pages(
+                crud.task.get_multy_tasks_sorted, order_by=order_by, order=order,
+                current_user=user, db_session=session)
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("case", CASES)
+async def test_task_queries_use_indexes(seeded_user, get_session, case):
+    with capture_statements() as statements:
+        await CASES[case](seeded_user, get_session)
+    assert statements
+
+    for statement, nodes in await explain(statements):
+        assert not nodes & (FORBIDDEN_NODES - ALLOWED_NODES.get(case, set())), f"{case}: {sorted(nodes)} in plan of\n{statement}"
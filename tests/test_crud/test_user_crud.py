@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import update
+
+from app import crud
+from app.crud.user_crud import user_cache
+from app.models.user_model import User
+
+
+@pytest.mark.asyncio
+async def test_cached_user_is_invalidated_on_update(get_session, test_user):
+    user_cache.clear()
+    user = await crud.user.get_cached_by_id(test_user.id, db_session=get_session)
+    assert user.id == test_user.id
+    assert "password_hash" not in user.model_dump()
+    await crud.user.get_cached_by_id(test_user.id, db_session=get_session)
+    assert user_cache.stats()["hits"] == 1
+
+    db_user = await crud.user.get_by_id(test_user.id, db_session=get_session)
+    db_user.name = "renamed"
+    get_session.add(db_user)
+    await get_session.commit()
+    assert user_cache.get(test_user.id) is None
+
+    user = await crud.user.get_cached_by_id(test_user.id, db_session=get_session)
+    assert user.name == "renamed"
+    db_user.name = "test"
+    get_session.add(db_user)
+    await get_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_cached_user_is_invalidated_after_commit(get_session, test_user):
+    user_id = test_user.id  # test_user expires with the rollback below
+    user_cache.clear()
+    stale = await crud.user.get_cached_by_id(user_id, db_session=get_session)
+    await get_session.execute(update(User).where(User.id == user_id).values(name="core update"))
+    # A concurrent request caching the old row before the commit must not keep it
+    user_cache.set(user_id, stale)
+    await get_session.commit()
+    assert user_cache.get(user_id) is None
+
+    user = await crud.user.get_cached_by_id(user_id, db_session=get_session)
+    assert user.name == "core update"
+    await get_session.execute(update(User).where(User.id == user_id).values(name="test"))
+    await get_session.rollback()
+    assert user_cache.get(user_id) is not None
+    await get_session.execute(update(User).where(User.id == user_id).values(name="test"))
+    await get_session.commit()
@@ -1,4 +1,8 @@
+import subprocess
+import sys
+
 import pytest
+from httpx import AsyncClient
 
 
 @pytest.mark.asyncio
@@ -8,3 +12,28 @@ async def test_root(test_client):
     assert response is not None
     assert response.status_code == 200
     assert response.json() == {"message": "Hello World"}
+
+
+def test_importing_main_does_not_build_the_app():
+    code = "import sys, app.main; assert 'app.api.api' not in sys.modules and 'app' not in vars(app.main)"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_create_app_builds_independent_apps():
+    from app.main import create_app
+
+    first, second = create_app(), create_app()
+    assert first is not second
+    assert {"/", "/task", "/auth/access-token"} <= {route.path for route in first.routes}
+
+
+@pytest.mark.asyncio
+async def test_dependency_overrides_apply_to_factory_built_app(test_user):
+    from app.api.deps import get_current_user
+    from app.main import create_app
+
+    app = create_app()
+    app.dependency_overrides[get_current_user] = lambda: test_user
+    async with AsyncClient(app=app, base_url="http://fastapi.localhost") as client:
+        response = await client.get("/task")
+    assert response.status_code == 200
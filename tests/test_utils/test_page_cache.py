@@ -0,0 +1,55 @@
+import pytest
+
+from app.utils.page_cache import PageCache, SQLitePageCacheBackend, get_page_cache_backend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    uri = "memory://" if request.param == "memory" else f"sqlite:///{tmp_path}/pages.sqlite"
+    return get_page_cache_backend(uri, max_bytes=100)
+
+
+def test_page_cache_invalidates_one_owner(backend):
+    cache = PageCache(backend, max_bytes=100)
+    cache.set(1, "a", b"one")
+    cache.set(1, "b", b"two")
+    cache.set(2, "a", b"three")
+    assert cache.get(1, "a") == b"one"
+    cache.invalidate(1)
+    assert cache.get(1, "a") is None
+    assert cache.get(1, "b") is None
+    assert cache.get(2, "a") == b"three"
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["bytes"] == 5
+
+
+def test_memory_backend_bounded_by_bytes():
+    cache = PageCache(get_page_cache_backend("memory://", max_bytes=10), max_bytes=10)
+    cache.set(1, "a", b"1234")
+    cache.set(1, "b", b"1234")
+    assert cache.get(1, "a") == b"1234"
+    cache.set(2, "a", b"1234")
+    assert cache.get(1, "b") is None
+    assert cache.get(1, "a") == b"1234"
+    cache.set(2, "b", b"x" * 11)
+    assert cache.get(2, "b") is None
+    assert cache.stats()["bytes"] == 8
+
+
+def test_sqlite_backend_shared_and_trimmed(tmp_path):
+    first = SQLitePageCacheBackend(f"{tmp_path}/pages.sqlite", max_bytes=10)
+    second = SQLitePageCacheBackend(f"{tmp_path}/pages.sqlite", max_bytes=10)
+    first.TRIM_EVERY = 1
+    first.set(1, "a", b"1234")
+    assert second.get(1, "a") == b"1234"
+    first.set(1, "b", b"1234")
+    first.set(1, "c", b"1234")
+    assert second.get(1, "a") is None
+    assert second.size() == 8
+
+
+def test_disabled_page_cache():
+    cache = PageCache(get_page_cache_backend("memory://", max_bytes=0), max_bytes=0)
+    cache.set(1, "a", b"")
+    assert cache.get(1, "a") is None
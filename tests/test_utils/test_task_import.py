@@ -0,0 +1,62 @@
+import pytest
+from fastapi import HTTPException
+
+from app.schemas.task_schema import ITaskImportFormatEnum
+from app.utils.task_import import TaskImportParser
+
+
+async def chunks(data: bytes, size: int = 7):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def parse(import_format: ITaskImportFormatEnum, data: bytes, **kwargs) -> tuple[list, TaskImportParser]:
+    parser = TaskImportParser(import_format, max_errors=kwargs.get("max_errors", 10), max_line_length=1000)
+    return [task async for task in parser.parse(chunks(data))], parser
+
+
+@pytest.mark.asyncio
+async def test_parse_ndjson_reports_bad_lines():
+    data = (
+        '{"title": "one", "description": "first"}\n'
+        '\n'
+        '{"description": "no title"}\n'
+        'not json\n'
+        '{"title": "żółw", "create_at": "2024-01-01T10:00:00Z"}'
+    ).encode()
+    tasks, parser = await parse(ITaskImportFormatEnum.ndjson, data)
+    assert [task.title for task in tasks] == ["one", "żółw"]
+    assert tasks[1].create_at.year == 2024
+    assert parser.failed == 2
+    assert [error.line for error in parser.errors] == [3, 4]
+    assert "title" in parser.errors[0].detail
+
+
+@pytest.mark.asyncio
+async def test_parse_csv_with_multiline_fields():
+    data = (
+        'id,title,description\r\n'
+        '1,one,"line one\nline ""two"""\r\n'
+        '2,two,\r\n'
+        '3,three\r\n'
+        '4,four,last'
+    ).encode()
+    tasks, parser = await parse(ITaskImportFormatEnum.csv, data)
+    assert [(task.title, task.description) for task in tasks] == [
+        ("one", 'line one\nline "two"'), ("two", None), ("four", "last")
+    ]
+    assert [(error.line, error.detail) for error in parser.errors] == [(5, "Expected 3 fields, got 2")]
+
+
+@pytest.mark.asyncio
+async def test_parse_limits():
+    with pytest.raises(HTTPException) as error:
+        await parse(ITaskImportFormatEnum.csv, b"description\nx\n")
+    assert error.value.status_code == 400
+
+    with pytest.raises(HTTPException) as error:
+        await parse(ITaskImportFormatEnum.ndjson, b'{"title": "' + b"x" * 2000 + b'"}\n')
+    assert error.value.status_code == 413
+
+    tasks, parser = await parse(ITaskImportFormatEnum.ndjson, b'{"title": "a\\u0000"}\n' * 20, max_errors=3)
+    assert tasks == [] and parser.failed == 20 and len(parser.errors) == 3